@@ -0,0 +1,218 @@
+"""
+Benchmarks of transform stack operations at production scale.
+
+Benchmarks run on the fake Guerilla backend and report, for each operation,
+wall time and Guerilla API call counts, across stack depths and node counts.
+Results are saved as JSON to compare scaling between versions:
+
+    $ python benchmarks/bench_stack.py --output bench.json --label 0.0.1
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import timeit
+
+os.environ.setdefault('GUERILLA_TRANSFORM_STACK_BACKEND', 'fake')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, 'src'))
+
+import guerilla_transform_stack as gts  # noqa: E402
+from guerilla_transform_stack.backend import guerilla  # noqa: E402
+
+# Transform types benchmarked by `add`.
+ADD_TYPES = ('euler', 'target', 'baked', 'constraint', 'shake')
+
+DEFAULT_DEPTHS = (1, 10, 100, 1000)
+DEFAULT_NODE_COUNTS = (100, 1000, 10000, 100000)
+
+# Transform depth of each node in node count benchmarks.
+NODE_DEPTH = 3
+
+
+def measure(func, repeat=1):
+    """Return wall time and Guerilla call counts of given function.
+
+    Args:
+        func (callable): Function to measure, without argument.
+        repeat (int, optional): Run count, best wall time is kept.
+
+    Returns:
+        dict: 'seconds' and 'calls' (API call count of one run).
+    """
+    best = None
+
+    for _ in range(repeat):
+
+        guerilla.calls.clear()
+
+        start = timeit.default_timer()
+        func()
+        elapsed = timeit.default_timer() - start
+
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {'seconds': best,
+            'calls': dict(guerilla.calls)}
+
+
+def build_stack(depth, cached=False):
+    """Return a transform stack of `depth` euler transforms on a new node.
+
+    Args:
+        depth (int):
+        cached (bool, optional): See `TransformStack`.
+
+    Returns:
+        TransformStack:
+    """
+    guerilla.reset()
+
+    with guerilla.Modifier() as mod:
+        node = mod.createnode("node", "SceneGraphNode")
+
+    ts = gts.TransformStack(node, cached=cached)
+    ts.add_many([('euler', "euler{}".format(i)) for i in range(depth)])
+
+    return ts
+
+
+def bench_depth(depth, repeat):
+    """Benchmark operations on a single transform stack of given depth.
+
+    Args:
+        depth (int): Transform count of the stack.
+        repeat (int): Run count of read only operations.
+
+    Yields:
+        dict: Result of each benchmark.
+    """
+    top_name = "euler{}".format(depth - 1)
+
+    for cached in (False, True):
+
+        ts = build_stack(depth, cached)
+
+        read_benchs = (('len', lambda: len(ts)),
+                       ('iter', lambda: list(ts)),
+                       ('getitem', lambda: ts[top_name]),
+                       ('top', lambda: ts.top),
+                       ('bottom', lambda: ts.bottom))
+
+        for name, func in read_benchs:
+
+            # Build cached snapshot outside of measure.
+            len(ts)
+
+            result = measure(func, repeat)
+            result.update(benchmark=name, depth=depth, nodes=1,
+                          cached=cached)
+            yield result
+
+        for type_ in ADD_TYPES:
+
+            ts = build_stack(depth, cached)
+            len(ts)
+
+            result = measure(lambda: ts.add(type_))
+            result.update(benchmark='add_' + type_, depth=depth, nodes=1,
+                          cached=cached)
+            yield result
+
+        mutate_benchs = (('move_top', lambda ts: ts.bottom.move_top()),
+                         ('move_bottom', lambda ts: ts.top.move_bottom()),
+                         ('delete', lambda ts: ts[depth // 2].delete()))
+
+        for name, func in mutate_benchs:
+
+            ts = build_stack(depth, cached)
+            len(ts)
+
+            result = measure(lambda: func(ts))
+            result.update(benchmark=name, depth=depth, nodes=1,
+                          cached=cached)
+            yield result
+
+
+def bench_nodes(node_count):
+    """Benchmark operations over many nodes.
+
+    Args:
+        node_count (int): Node count, each having `NODE_DEPTH` transforms.
+
+    Yields:
+        dict: Result of each benchmark.
+    """
+    guerilla.reset()
+
+    with guerilla.Modifier() as mod:
+        nodes = [mod.createnode("node{}".format(i), "SceneGraphNode")
+                 for i in range(node_count)]
+
+    spec = [('euler', None)] * NODE_DEPTH
+
+    result = measure(lambda: gts.bulk_add(nodes, spec))
+    result.update(benchmark='bulk_add', depth=NODE_DEPTH, nodes=node_count,
+                  cached=False)
+    yield result
+
+    benchs = (('len', lambda: [len(gts.TransformStack(n)) for n in nodes]),
+              ('iter', lambda: [list(gts.TransformStack(n)) for n in nodes]),
+              ('top', lambda: [gts.TransformStack(n).top for n in nodes]),
+              ('iter_stacks', lambda: list(gts.iter_stacks(nodes))))
+
+    for name, func in benchs:
+        result = measure(func)
+        result.update(benchmark=name, depth=NODE_DEPTH, nodes=node_count,
+                      cached=False)
+        yield result
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--depths', type=int, nargs='+',
+                        default=DEFAULT_DEPTHS,
+                        help="stack depths of single stack benchmarks")
+    parser.add_argument('--nodes', type=int, nargs='+',
+                        default=DEFAULT_NODE_COUNTS,
+                        help="node counts of scene benchmarks")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="run count of read only benchmarks")
+    parser.add_argument('--label', default='',
+                        help="label saved with results, like a version")
+    parser.add_argument('--output', help="JSON file to save results to")
+
+    args = parser.parse_args(argv)
+
+    results = []
+
+    for depth in args.depths:
+        results.extend(bench_depth(depth, args.repeat))
+
+    for node_count in args.nodes:
+        results.extend(bench_nodes(node_count))
+
+    for r in results:
+        print("{benchmark:>16} depth={depth:<5} nodes={nodes:<7} "
+              "cached={cached:d} {seconds:10.6f}s calls={total}"
+              .format(total=sum(r['calls'].values()), **r))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'label': args.label,
+                       'date': datetime.datetime.now().isoformat(),
+                       'python': platform.python_version(),
+                       'results': results}, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,8 @@ setup(name='guerilla-transform-stack',
       keywords='guerilla, transform, stack',
       packages=['guerilla_transform_stack'],
       package_dir={'': 'src'},
+      extras_require={'numpy': ['numpy'],
+                      'parallel': ['futures; python_version < "3"']},
       classifiers=[
           'Development Status :: 3 - Alpha',
           'License :: OSI Approved :: MIT License',
@@ -1,5 +1,105 @@
 """
 This package expose `TransformStack`, a wrapper class around the Guerilla
 transform stack of a scene graph node.
+
+Submodules are imported on first access to the names they expose, and
+Guerilla on first use, so importing the package is almost free.
 """
-from .transform_stack import TransformStack
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+import importlib
+import sys
+
+# Public name to submodule relation.
+_lazy_attributes = {'TransformStack': 'transform_stack',
+                    'add_targets': 'transform_stack',
+                    'bake_many': 'transform_stack',
+                    'bulk_add': 'transform_stack',
+                    'constrain_many': 'transform_stack',
+                    'evaluate_many': 'transform_stack',
+                    'register_transform_class': 'transform_stack',
+                    'get_srt_many': 'transform',
+                    'preview_shakes': 'transform',
+                    'set_srt_many': 'transform',
+                    'set_shake_params': 'transform',
+                    'iter_stacks': 'scene',
+                    'collect_stacks': 'scene',
+                    'dump_stacks': 'serialize',
+                    'export_stacks': 'serialize',
+                    'load_stacks': 'serialize',
+                    'iter_stack_chunks': 'pipeline',
+                    'map_stacks': 'pipeline',
+                    'profile': 'profiling',
+                    'changed_since': 'tracking',
+                    'current_generation': 'tracking',
+                    'forget_stacks': 'tracking',
+                    'poll_stacks': 'tracking'}
+
+# Python 2 needs native strings for "from ... import *".
+__all__ = [str(name) for name in sorted(_lazy_attributes)]
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        """Import the submodule exposing given name, or given submodule."""
+        if name in _lazy_attributes:
+            value = getattr(importlib.import_module(
+                '.' + _lazy_attributes[name], __name__), name)
+        else:
+            try:
+                value = importlib.import_module('.' + name, __name__)
+            except ModuleNotFoundError as e:
+                if e.name != '{}.{}'.format(__name__, name):
+                    raise
+                raise AttributeError("module '{}' has no attribute '{}'"
+                                     .format(__name__, name))
+
+        globals()[name] = value
+
+        return value
+
+    def __dir__():
+        return sorted(set(globals()) | set(_lazy_attributes))
+
+else:
+
+    import pkgutil
+    import types
+
+    class _LazyModule(types.ModuleType):
+        """Package module importing submodules on first access to the names
+        they expose, as module level __getattr__ is not supported.
+        """
+
+        def __getattr__(self, name):
+            """Import the submodule exposing given name, or given submodule.
+            """
+            if name in _lazy_attributes:
+                value = getattr(importlib.import_module(
+                    '.' + _lazy_attributes[name], self.__name__), name)
+            elif name in set(module_name for _, module_name, _
+                             in pkgutil.iter_modules(self.__path__)):
+                value = importlib.import_module('.' + name, self.__name__)
+            else:
+                raise AttributeError("module '{}' has no attribute '{}'"
+                                     .format(self.__name__, name))
+
+            setattr(self, name, value)
+
+            return value
+
+        def __dir__(self):
+            return sorted(set(vars(self)) | set(_lazy_attributes))
+
+    _lazy_module = _LazyModule(__name__, __doc__)
+    _lazy_module.__dict__.update(globals())
+
+    # Python 2 clears globals of garbage collected modules, `_LazyModule`
+    # methods still use this one's.
+    _lazy_module._original_module = sys.modules[__name__]
+
+    sys.modules[__name__] = _lazy_module
@@ -0,0 +1,103 @@
+"""
+This module resolves the Guerilla module used by the package.
+
+Guerilla Python module is used by default. Another backend, like the
+`fake_guerilla` stand-in to run outside of Guerilla, can be selected with the
+`GUERILLA_TRANSFORM_STACK_BACKEND` environment variable before the package
+first uses it:
+
+    $ GUERILLA_TRANSFORM_STACK_BACKEND=fake python -m unittest \
+        guerilla_transform_stack.test
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+import importlib
+import os
+
+# Environment variable selecting the backend.
+BACKEND_ENV_VAR = 'GUERILLA_TRANSFORM_STACK_BACKEND'
+
+# Backend name to module name relation.
+backends = {'guerilla': 'guerilla',
+            'fake': 'guerilla_transform_stack.fake_guerilla'}
+
+
+def register_backend(name, module_name):
+    """Register a module implementing Guerilla API as backend.
+
+    Args:
+        name (str): Backend name, to use in environment variable.
+        module_name (str): Absolute name of the module to import.
+    """
+    backends[name] = module_name
+
+
+def load_backend(name=None):
+    """Import and return backend module.
+
+    Args:
+        name (str, optional): Backend name, read from environment variable
+          (default to 'guerilla') if not provided.
+
+    Returns:
+        module: Module implementing Guerilla API.
+
+    Raises:
+        ValueError: If backend name is not registered.
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_ENV_VAR, 'guerilla')
+
+    try:
+        module_name = backends[name]
+    except KeyError:
+        raise ValueError("invalid guerilla backend '{}'".format(name))
+
+    return importlib.import_module(module_name)
+
+
+class _LazyBackend(object):
+    """Stand-in of the backend module, importing it on first attribute
+    access, so importing the package doesn't import Guerilla.
+    """
+    __slots__ = ('_module',)
+
+    def __init__(self):
+        object.__setattr__(self, '_module', None)
+
+    def __repr__(self):
+        if self._module is None:
+            return "<unloaded guerilla backend>"
+
+        return repr(self._module)
+
+    def __getattr__(self, name):
+        return getattr(get_backend(), name)
+
+    def __setattr__(self, name, value):
+        setattr(get_backend(), name, value)
+
+    def __delattr__(self, name):
+        delattr(get_backend(), name)
+
+
+def get_backend():
+    """Return backend module used by the package, importing it on first
+    call.
+
+    Returns:
+        module: Module implementing Guerilla API.
+    """
+    module = guerilla._module
+
+    if module is None:
+        module = load_backend()
+        object.__setattr__(guerilla, '_module', module)
+
+    return module
+
+
+guerilla = _LazyBackend()
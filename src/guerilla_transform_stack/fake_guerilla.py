@@ -0,0 +1,576 @@
+"""
+This module is a pure-Python stand-in of the subset of the Guerilla API used
+by this package, to run tests and benchmarks outside of Guerilla.
+
+Select it with the `GUERILLA_TRANSFORM_STACK_BACKEND=fake` environment
+variable (see `backend` module).
+
+Transform nodes are chained like in Guerilla: the `Out` plug of each
+transform is connected to the `In` plug of the transform below it, the
+bottom one being connected to the `Transform` plug of the scene graph node.
+Matrices follow the `asarray()` layout of Guerilla, rotations being applied
+in X, Y, Z order. Target, constraint and shake transforms are evaluated in a
+simplified way: constraint transforms follow their first constraining object
+and the others give identity matrices.
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+import collections
+import math
+
+# Call count of each API entry point, used by benchmarks.
+calls = collections.Counter()
+
+_IDENTITY = (1.0, 0.0, 0.0, 0.0,
+             0.0, 1.0, 0.0, 0.0,
+             0.0, 0.0, 1.0, 0.0,
+             0.0, 0.0, 0.0, 1.0)
+
+
+class matrix(object):
+    """4x4 row-major matrix, row vector convention (translation in last row).
+    """
+
+    def __init__(self, values=None):
+        self._m = list(_IDENTITY if values is None else values)
+
+    def asarray(self):
+        return list(self._m)
+
+    def __mul__(self, other):
+        a, b = self._m, other._m
+        return matrix([sum(a[r*4+k] * b[k*4+c] for k in range(4))
+                       for r in range(4) for c in range(4)])
+
+    @staticmethod
+    def createcomposite(sx, sy, sz, rx, ry, rz, tx, ty, tz):
+        cx, cy, cz = math.cos(rx), math.cos(ry), math.cos(rz)
+        nx, ny, nz = math.sin(rx), math.sin(ry), math.sin(rz)
+        # R = Rx * Ry * Rz (row vectors, X applied first).
+        r = [cy*cz, cy*nz, -ny,
+             nx*ny*cz - cx*nz, nx*ny*nz + cx*cz, nx*cy,
+             cx*ny*cz + nx*nz, cx*ny*nz - nx*cz, cx*cy]
+        return matrix([sx*r[0], sx*r[1], sx*r[2], 0.0,
+                       sy*r[3], sy*r[4], sy*r[5], 0.0,
+                       sz*r[6], sz*r[7], sz*r[8], 0.0,
+                       tx, ty, tz, 1.0])
+
+    def decompose(self):
+        m = self._m
+        sx = math.sqrt(m[0]**2 + m[1]**2 + m[2]**2)
+        sy = math.sqrt(m[4]**2 + m[5]**2 + m[6]**2)
+        sz = math.sqrt(m[8]**2 + m[9]**2 + m[10]**2)
+        r = [m[0]/sx, m[1]/sx, m[2]/sx,
+             m[4]/sy, m[5]/sy, m[6]/sy,
+             m[8]/sz, m[9]/sz, m[10]/sz]
+        ry = math.asin(max(-1.0, min(1.0, -r[2])))
+        if abs(math.cos(ry)) > 1e-9:
+            rx = math.atan2(r[5], r[8])
+            rz = math.atan2(r[1], r[0])
+        else:
+            rx = math.atan2(-r[7], r[4])
+            rz = 0.0
+        return sx, sy, sz, rx, ry, rz, m[12], m[13], m[14]
+
+    def inverse(self):
+        m = self._m
+        # General 4x4 inverse by Gauss-Jordan elimination.
+        a = [list(m[r*4:r*4+4]) + [1.0 if r == c else 0.0 for c in range(4)]
+             for r in range(4)]
+        for c in range(4):
+            p = max(range(c, 4), key=lambda r: abs(a[r][c]))
+            a[c], a[p] = a[p], a[c]
+            pv = a[c][c]
+            a[c] = [v / pv for v in a[c]]
+            for r in range(4):
+                if r != c:
+                    f = a[r][c]
+                    a[r] = [v - f * w for v, w in zip(a[r], a[c])]
+        return matrix([a[r][4+c] for r in range(4) for c in range(4)])
+
+
+class point3(object):
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x, self.y, self.z = x, y, z
+
+
+class transform(matrix):
+
+    def translate(self, p):
+        t = matrix([1.0, 0.0, 0.0, 0.0,
+                    0.0, 1.0, 0.0, 0.0,
+                    0.0, 0.0, 1.0, 0.0,
+                    p.x, p.y, p.z, 1.0])
+        self._m = (t * self)._m
+
+
+def types(name, desc=None):
+    return (name, desc)
+
+
+class Plug(object):
+    """Node attribute, optionally animated, connected or holding
+    dependencies.
+    """
+
+    def __init__(self, parent, name, value=None):
+        self.parent = parent
+        self.name = name
+        self._value = value
+        self._keys = None
+        self._input = None
+        self._outputs = []
+        self._dependencies = []
+
+    def __repr__(self):
+        return "Plug('{}.{}')".format(self.parent.path, self.name)
+
+    def get(self):
+        calls['get'] += 1
+        if self._input is not None:
+            return self._input.get()
+        if self._keys:
+            return self._eval_keys(Document().getframe())
+        return self._value
+
+    def _eval_keys(self, frame):
+        frames = sorted(self._keys)
+        if frame <= frames[0]:
+            return self._keys[frames[0]]
+        if frame >= frames[-1]:
+            return self._keys[frames[-1]]
+        for f0, f1 in zip(frames, frames[1:]):
+            if f0 <= frame <= f1:
+                k = (frame - f0) / float(f1 - f0)
+                return self._keys[f0] * (1.0 - k) + self._keys[f1] * k
+
+    def set(self, value):
+        calls['set'] += 1
+        self._keys = None
+        self._value = value
+
+    def setkey(self, frame, value):
+        calls['setkey'] += 1
+        if self._keys is None:
+            self._keys = {}
+        self._keys[frame] = value
+
+    def isanimated(self):
+        calls['isanimated'] += 1
+        return bool(self._keys)
+
+    def getkeys(self):
+        calls['getkeys'] += 1
+        return sorted((self._keys or {}).items())
+
+    def getinput(self):
+        calls['getinput'] += 1
+        return self._input
+
+    def getoutputs(self):
+        calls['getoutputs'] += 1
+        return list(self._outputs)
+
+    def adddependency(self, plug):
+        self._dependencies.append(plug)
+
+    def removedependency(self, plug):
+        self._dependencies.remove(plug)
+
+    def removealldependencies(self):
+        del self._dependencies[:]
+
+    def getdependencies(self):
+        return list(self._dependencies)
+
+    def delete(self):
+        _disconnect_all(self)
+        del self.parent._plugs[self.name]
+
+
+class _OutPlug(Plug):
+    """Output plug of a transform node, computing the transform matrix.
+    """
+
+    def get(self):
+        calls['get'] += 1
+        return self.parent._output()
+
+
+class _WorldPlug(Plug):
+    """World transform plug of a scene graph node.
+    """
+
+    def get(self):
+        calls['get'] += 1
+        return self.parent.getworldmatrix()
+
+
+def _connect(in_plug, out_plug):
+    if in_plug._input is not None:
+        _disconnect(in_plug, in_plug._input)
+    in_plug._input = out_plug
+    out_plug._outputs.append(in_plug)
+
+
+def _disconnect(in_plug, out_plug):
+    if in_plug._input is out_plug:
+        in_plug._input = None
+        out_plug._outputs.remove(in_plug)
+
+
+def _disconnect_all(plug):
+    if plug._input is not None:
+        _disconnect(plug, plug._input)
+    for out in list(plug._outputs):
+        _disconnect(out, plug)
+
+
+class Node(object):
+    """Base node, exposing its plugs as attributes.
+    """
+
+    _plug_defaults = ()
+
+    def __init__(self, name, parent=None):
+        self.__dict__['_plugs'] = collections.OrderedDict()
+        self.name = name
+        self.parent = parent
+        self._children = collections.OrderedDict()
+        for plug_name, value in self._plug_defaults:
+            self._add_plug(plug_name, value)
+
+    def _add_plug(self, name, value=None, cls=Plug):
+        plug = cls(self, name, value)
+        self._plugs[name] = plug
+        return plug
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['_plugs'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __repr__(self):
+        return "<guerilla.{} '{}'>".format(self.__class__.__name__,
+                                           self.path)
+
+    @property
+    def path(self):
+        calls['path'] += 1
+        if self.parent is None or self.parent.parent is None:
+            return self.name
+        return self.parent.path + '|' + self.name
+
+    def createplug(self, name, cls, type_, flags=0, value=None):
+        return self._add_plug(name, value)
+
+    def getplug(self, name):
+        return self._plugs[name]
+
+    def listplugs(self):
+        return list(self._plugs.values())
+
+    def children(self, type=None, recursive=False):
+        result = []
+        for child in self._children.values():
+            if type is None or _isinstance(child, type):
+                result.append(child)
+            if recursive:
+                result.extend(child.children(type, recursive))
+        return result
+
+    def delete(self):
+        for child in list(self._children.values()):
+            child.delete()
+        for plug in self._plugs.values():
+            _disconnect_all(plug)
+        if self.parent is not None:
+            del self.parent._children[self.name]
+        self.parent = None
+
+
+class Document(Node):
+    """Root node, holding the current frame.
+    """
+
+    _instance = None
+
+    def __new__(cls):
+        if Document._instance is None:
+            inst = object.__new__(cls)
+            Node.__init__(inst, '')
+            inst._frame = 1.0
+            Document._instance = inst
+        return Document._instance
+
+    def __init__(self):
+        pass
+
+    def getframe(self):
+        return self._frame
+
+    def setframe(self, frame):
+        self._frame = frame
+
+
+class SceneGraphNode(Node):
+    """Node with a transform stack.
+    """
+
+    def __init__(self, name, parent=None):
+        super(SceneGraphNode, self).__init__(name, parent)
+        self._add_plug('Transform', matrix())
+        self._add_plug('_WorldTransform', cls=_WorldPlug)
+
+    def _base_matrix(self):
+        return self._plugs['Transform']._value or matrix()
+
+    def getmatrix(self):
+        in_plug = self._plugs['Transform']._input
+        if in_plug is None:
+            return self._base_matrix()
+        return in_plug.get()
+
+    def setmatrix(self, mtx):
+        self._plugs['Transform']._value = matrix(mtx.asarray())
+
+    def getworldmatrix(self):
+        mtx = self.getmatrix()
+        parent = self.parent
+        if isinstance(parent, SceneGraphNode):
+            mtx = mtx * parent.getworldmatrix()
+        return mtx
+
+    def setworldmatrix(self, mtx):
+        parent = self.parent
+        if isinstance(parent, SceneGraphNode):
+            mtx = mtx * parent.getworldmatrix().inverse()
+        self.setmatrix(mtx)
+
+    def gettransform(self):
+        top = self
+        in_plug = self._plugs['Transform']._input
+        while in_plug is not None:
+            top = in_plug.parent
+            in_plug = top._plugs['In']._input
+        return top
+
+
+class Target(SceneGraphNode):
+    pass
+
+
+class Transform(Node):
+    """Base transform node.
+    """
+
+    def __init__(self, name, parent=None):
+        super(Transform, self).__init__(name, parent)
+        self._add_plug('In')
+        self._add_plug('Out', cls=_OutPlug)
+
+    def _local(self, input_mtx):
+        return matrix()
+
+    def _output(self):
+        # Evaluate from the top of the stack, without recursion so deep
+        # stacks don't reach Python recursion limit.
+        chain = [self]
+        in_plug = self._plugs['In']._input
+        while in_plug is not None:
+            chain.append(in_plug.parent)
+            in_plug = in_plug.parent._plugs['In']._input
+        mtx = matrix()
+        for node in reversed(chain):
+            mtx = node._local(mtx)
+        return mtx
+
+    def getmatrix(self):
+        return self._output()
+
+    # Stack helpers, relinking neighbour transforms only.
+    def _below_plug(self):
+        """Plug fed by this transform (`In` of the transform below, or
+        `Transform` of the scene graph node).
+        """
+        for plug in self._plugs['Out']._outputs:
+            if plug.name in ('In', 'Transform'):
+                return plug
+
+    def _above(self):
+        in_plug = self._plugs['In']._input
+        return in_plug.parent if in_plug is not None else None
+
+    def _detach(self):
+        below_plug = self._below_plug()
+        above = self._above()
+        if below_plug is None:
+            return
+        if above is not None:
+            _connect(below_plug, above._plugs['Out'])
+        else:
+            _disconnect(below_plug, self._plugs['Out'])
+        _disconnect_all(self._plugs['In'])
+
+    def _swap_with_above(self):
+        above = self._above()
+        if above is None:
+            return
+        below_plug = self._below_plug()
+        top = above._above()
+        _connect(below_plug, above._plugs['Out'])
+        _connect(above._plugs['In'], self._plugs['Out'])
+        if top is not None:
+            _connect(self._plugs['In'], top._plugs['Out'])
+        else:
+            _disconnect_all(self._plugs['In'])
+
+    def moveup(self):
+        self._swap_with_above()
+
+    def movedown(self):
+        below_plug = self._below_plug()
+        if below_plug is not None and below_plug.name == 'In':
+            below_plug.parent._swap_with_above()
+
+    def movetop(self):
+        self._detach()
+        top = self.parent.gettransform()
+        top_plug = (top._plugs['In'] if top is not self.parent
+                    else top._plugs['Transform'])
+        _connect(top_plug, self._plugs['Out'])
+
+    def delete(self):
+        self._detach()
+        super(Transform, self).delete()
+
+
+_SRT = (('SX', 1.0), ('SY', 1.0), ('SZ', 1.0),
+        ('RX', 0.0), ('RY', 0.0), ('RZ', 0.0),
+        ('TX', 0.0), ('TY', 0.0), ('TZ', 0.0))
+
+
+class _SRTTransform(Transform):
+    """Transform evaluated from its scale, rotation and translation plugs.
+    """
+
+    _plug_defaults = _SRT
+
+    def _local(self, input_mtx):
+        p = self._plugs
+        values = [p[name].get() for name, _ in _SRT]
+        values[3:6] = [math.radians(v) for v in values[3:6]]
+        return matrix.createcomposite(*values) * input_mtx
+
+
+class TransformEuler(_SRTTransform):
+    pass
+
+
+class TransformBaked(_SRTTransform):
+    pass
+
+
+class TransformTarget(Transform):
+
+    def __init__(self, name, parent=None):
+        super(TransformTarget, self).__init__(name, parent)
+        self._add_plug('TargetWorldTransform')
+
+    def _local(self, input_mtx):
+        return input_mtx
+
+
+class TransformConstraint(Transform):
+
+    def __init__(self, name, parent=None):
+        super(TransformConstraint, self).__init__(name, parent)
+        self._add_plug('Objects')
+
+    def _local(self, input_mtx):
+        deps = self._plugs['Objects']._dependencies
+        if not deps:
+            return input_mtx
+        return deps[0].parent.getworldmatrix()
+
+
+class TransformShake(Transform):
+
+    _plug_defaults = (('Amplitude', 1.0), ('Frequency', 1.0), ('Seed', 0))
+
+    def _local(self, input_mtx):
+        return input_mtx
+
+
+_node_types = {cls.__name__: cls
+               for cls in (Node, SceneGraphNode, Target, TransformEuler,
+                           TransformBaked, TransformTarget,
+                           TransformConstraint, TransformShake)}
+
+
+def _isinstance(node, type_name):
+    return isinstance(node, _node_types.get(type_name, ()))
+
+
+def _unique_name(parent, name):
+    names = parent._children
+    if name not in names:
+        return name
+    i = 1
+    while '{}{}'.format(name, i) in names:
+        i += 1
+    return '{}{}'.format(name, i)
+
+
+def getclassname(node):
+    calls['getclassname'] += 1
+    return node.__class__.__name__
+
+
+def pynode(path, parent=None):
+    node = parent or Document()
+    for name in path.split('|'):
+        node = node._children[name]
+    return node
+
+
+class Modifier(object):
+    """Modifications are applied immediately, without undo support.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def createnode(self, name, type_, parent=None):
+        calls['createnode'] += 1
+        if parent is None:
+            parent = Document()
+        node = _node_types[type_](_unique_name(parent, name), parent)
+        parent._children[node.name] = node
+        return node
+
+    def deletenode(self, node):
+        node.delete()
+
+    def connect(self, in_plug, out_plug):
+        calls['connect'] += 1
+        _connect(in_plug, out_plug)
+
+    def disconnect(self, in_plug, out_plug):
+        calls['disconnect'] += 1
+        _disconnect(in_plug, out_plug)
+
+
+def reset():
+    """Clear document and call counters.
+    """
+    Document._instance = None
+    calls.clear()
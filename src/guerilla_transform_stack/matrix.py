@@ -0,0 +1,307 @@
+"""
+This module contains NumPy functions to evaluate transforms in batch.
+
+Matrices are 4x4 arrays following Guerilla `matrix.asarray()` layout: row
+vector convention, with translation on the last row. Rotations are Euler
+angles in degrees, applied in X, Y, Z order.
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+import numpy
+
+from .backend import guerilla
+from .transform import SRT_PLUG_NAMES
+
+# Guerilla class names of transforms having SRT plugs.
+_SRT_CLASS_NAMES = ('TransformEuler', 'TransformBaked')
+
+
+def read_srt(nodes):
+    """Return scale, rotation and translation parameters of given nodes.
+
+    Args:
+        nodes (list[guerilla.Transform]): Guerilla transform nodes with SRT
+          plugs (euler or baked).
+
+    Returns:
+        numpy.ndarray: (N, 9) array of SX, SY, SZ, RX, RY, RZ, TX, TY, TZ
+          values.
+    """
+    srt = numpy.empty((len(nodes), 9))
+
+    for i, node in enumerate(nodes):
+        srt[i] = [getattr(node, name).get() for name in SRT_PLUG_NAMES]
+
+    return srt
+
+
+def local_matrices(nodes):
+    """Return local matrices of given Guerilla transform nodes.
+
+    Euler and baked transforms are evaluated from their SRT plugs. Other
+    transform types depend on other nodes or on time and give identity
+    matrices.
+
+    Args:
+        nodes (list[guerilla.Transform]): Guerilla transform nodes.
+
+    Returns:
+        numpy.ndarray: (N, 4, 4) array of matrices.
+    """
+    nodes = list(nodes)
+
+    srt_ids = [i for i, node in enumerate(nodes)
+               if guerilla.getclassname(node) in _SRT_CLASS_NAMES]
+
+    matrices = numpy.tile(numpy.eye(4), (len(nodes), 1, 1))
+
+    if srt_ids:
+        matrices[srt_ids] = compose(read_srt([nodes[i] for i in srt_ids]))
+
+    return matrices
+
+
+def compose(srt):
+    """Return matrices from scale, rotation and translation parameters.
+
+    Args:
+        srt (numpy.ndarray): (N, 9) array of SX, SY, SZ, RX, RY, RZ, TX, TY,
+          TZ values.
+
+    Returns:
+        numpy.ndarray: (N, 4, 4) array of matrices.
+    """
+    srt = numpy.asarray(srt, dtype=float).reshape(-1, 9)
+
+    sx, sy, sz = srt[:, 0], srt[:, 1], srt[:, 2]
+    rx, ry, rz = numpy.radians(srt[:, 3:6]).T
+
+    cx, cy, cz = numpy.cos(rx), numpy.cos(ry), numpy.cos(rz)
+    nx, ny, nz = numpy.sin(rx), numpy.sin(ry), numpy.sin(rz)
+
+    mtx = numpy.zeros((len(srt), 4, 4))
+
+    # Scale * RotateX * RotateY * RotateZ * Translate.
+    mtx[:, 0, 0] = sx * cy * cz
+    mtx[:, 0, 1] = sx * cy * nz
+    mtx[:, 0, 2] = sx * -ny
+    mtx[:, 1, 0] = sy * (nx * ny * cz - cx * nz)
+    mtx[:, 1, 1] = sy * (nx * ny * nz + cx * cz)
+    mtx[:, 1, 2] = sy * nx * cy
+    mtx[:, 2, 0] = sz * (cx * ny * cz + nx * nz)
+    mtx[:, 2, 1] = sz * (cx * ny * nz - nx * cz)
+    mtx[:, 2, 2] = sz * cx * cy
+    mtx[:, 3, :3] = srt[:, 6:9]
+    mtx[:, 3, 3] = 1.0
+
+    return mtx
+
+
+def decompose(matrices):
+    """Return scale, rotation and translation parameters of matrices.
+
+    Inverse of `compose()`, for matrices without shearing nor negative
+    scale.
+
+    Args:
+        matrices (numpy.ndarray): (N, 4, 4) array of matrices.
+
+    Returns:
+        numpy.ndarray: (N, 9) array of SX, SY, SZ, RX, RY, RZ, TX, TY, TZ
+          values, rotations in degrees.
+    """
+    matrices = numpy.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+
+    scale = numpy.linalg.norm(matrices[:, :3, :3], axis=2)
+
+    rot = matrices[:, :3, :3] / scale[:, :, numpy.newaxis]
+
+    ry = numpy.arcsin(numpy.clip(-rot[:, 0, 2], -1.0, 1.0))
+
+    # Gimbal lock: Z rotation is merged into X rotation.
+    locked = numpy.abs(numpy.cos(ry)) < 1e-9
+
+    rx = numpy.where(locked,
+                     numpy.arctan2(-rot[:, 2, 1], rot[:, 1, 1]),
+                     numpy.arctan2(rot[:, 1, 2], rot[:, 2, 2]))
+    rz = numpy.where(locked,
+                     0.0,
+                     numpy.arctan2(rot[:, 0, 1], rot[:, 0, 0]))
+
+    srt = numpy.empty((len(matrices), 9))
+    srt[:, 0:3] = scale
+    srt[:, 3:6] = numpy.degrees(numpy.stack([rx, ry, rz], axis=1))
+    srt[:, 6:9] = matrices[:, 3, :3]
+
+    return srt
+
+
+def round_trips(srt, matrices, tolerance=1e-6):
+    """Return whether scale, rotation and translation parameters give back
+    given matrices.
+
+    `decompose()` can't represent shear, so parameters of sheared matrices
+    give other matrices.
+
+    Args:
+        srt (numpy.ndarray): (N, 9) array of parameters, as returned by
+          `decompose()`.
+        matrices (numpy.ndarray): (N, 4, 4) array of decomposed matrices.
+        tolerance (float, optional): Maximum difference of each matrix
+          value.
+
+    Returns:
+        numpy.ndarray: (N,) array of booleans.
+    """
+    matrices = numpy.asarray(matrices, dtype=float).reshape(-1, 4, 4)
+
+    return (numpy.abs(compose(srt) - matrices) <= tolerance).all(axis=(1, 2))
+
+
+def translate(matrices, offsets):
+    """Return matrices translated by offsets expressed in their own space,
+    like `guerilla.transform.translate()`.
+
+    Args:
+        matrices (numpy.ndarray): (N, 4, 4) array of matrices.
+        offsets (numpy.ndarray): (N, 3) array of offsets, or a single (3,)
+          offset for every matrix.
+
+    Returns:
+        numpy.ndarray: (N, 4, 4) array of translated matrices.
+    """
+    matrices = numpy.array(matrices, dtype=float).reshape(-1, 4, 4)
+
+    points = numpy.ones((len(matrices), 4))
+    points[:, :3] = numpy.asarray(offsets, dtype=float).reshape(-1, 3)
+
+    matrices[:, 3] = numpy.einsum('ni,nij->nj', points, matrices)
+
+    return matrices
+
+
+def accumulate(matrices):
+    """Return running product of given matrices, from bottom to top.
+
+    Args:
+        matrices (numpy.ndarray): (N, 4, 4) array of transform matrices, from
+          bottom to top.
+
+    Returns:
+        numpy.ndarray: (N, 4, 4) array where each matrix is the product of
+          the matrices below and including it.
+    """
+    result = numpy.array(matrices, dtype=float)
+
+    for i in range(1, len(result)):
+        result[i] = numpy.dot(result[i - 1], result[i])
+
+    return result
+
+
+def reduce_stacks(matrices, depths):
+    """Return product of each group of matrices.
+
+    Groups are padded with identity matrices to the deepest one, so products
+    are computed for every group at once.
+
+    Args:
+        matrices (numpy.ndarray): (N, 4, 4) array of transform matrices of
+          every group, concatenated from bottom to top.
+        depths (list[int]): Matrix count of each group.
+
+    Returns:
+        numpy.ndarray: (len(depths), 4, 4) array of group products. Empty
+          groups give identity matrices.
+    """
+    depths = numpy.asarray(depths, dtype=int)
+
+    max_depth = depths.max() if len(depths) else 0
+
+    padded = numpy.tile(numpy.eye(4), (len(depths), max(max_depth, 1), 1, 1))
+
+    # Position of each matrix in its group.
+    starts = numpy.cumsum(depths) - depths
+    group = numpy.repeat(numpy.arange(len(depths)), depths)
+    level = numpy.arange(len(group)) - numpy.repeat(starts, depths)
+
+    padded[group, level] = matrices
+
+    result = padded[:, 0]
+
+    for i in range(1, max_depth):
+        result = numpy.matmul(result, padded[:, i])
+
+    return result
+
+
+def _lattice(seeds, axis, points):
+    """Return pseudo random values in [-1, 1] of integer lattice points.
+
+    Args:
+        seeds (numpy.ndarray): (N, 1) array of random seeds.
+        axis (int): Axis index, so each axis gets different values.
+        points (numpy.ndarray): (N, F) array of lattice points.
+
+    Returns:
+        numpy.ndarray: (N, F) array of values.
+    """
+    # FNV-1a over seed, axis and point, followed by an avalanche step.
+    h = numpy.full(points.shape, 2166136261, dtype=numpy.uint32)
+
+    for key in (seeds, numpy.full_like(seeds, axis), points):
+        h ^= key.astype(numpy.uint32)
+        h *= numpy.uint32(16777619)
+
+    h ^= h >> numpy.uint32(16)
+    h *= numpy.uint32(0x7feb352d)
+    h ^= h >> numpy.uint32(15)
+    h *= numpy.uint32(0x846ca68b)
+    h ^= h >> numpy.uint32(16)
+
+    return h / 2147483647.5 - 1.0
+
+
+def shake_offsets(amplitudes, frequencies, seeds, frames):
+    """Return translation offsets of shake transforms over frames.
+
+    Offsets follow a smooth value noise of each axis, scaled by amplitude,
+    sampling `frequency` random values per frame, and depending only on
+    seed. It's meant to preview and tune many shakes at once, not to match
+    Guerilla evaluation bit for bit.
+
+    Args:
+        amplitudes (list[float]): Amplitude of each shake.
+        frequencies (list[float]): Frequency of each shake.
+        seeds (list[int]): Random seed of each shake.
+        frames (list[float]): Frames to evaluate.
+
+    Returns:
+        numpy.ndarray: (len(amplitudes), len(frames), 3) array of X, Y, Z
+          offsets.
+    """
+    amplitudes = numpy.asarray(amplitudes, dtype=float).reshape(-1, 1)
+    frequencies = numpy.asarray(frequencies, dtype=float).reshape(-1, 1)
+    seeds = numpy.asarray(seeds, dtype=numpy.int64).reshape(-1, 1)
+    frames = numpy.asarray(frames, dtype=float).reshape(1, -1)
+
+    t = frames * frequencies
+
+    start = numpy.floor(t)
+    fract = t - start
+    start = start.astype(numpy.int64)
+
+    # Smoothstep between lattice values.
+    weight = fract * fract * (3.0 - 2.0 * fract)
+
+    offsets = numpy.empty(t.shape + (3,))
+
+    for axis in range(3):
+        v0 = _lattice(seeds, axis, start)
+        v1 = _lattice(seeds, axis, start + 1)
+        offsets[:, :, axis] = amplitudes * (v0 + (v1 - v0) * weight)
+
+    return offsets
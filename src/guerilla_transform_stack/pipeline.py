@@ -0,0 +1,140 @@
+"""
+This module contains functions processing transform stacks of many nodes in
+parallel.
+
+Guerilla API is single threaded: stack descriptions (see
+`TransformStack.to_dict()`) are read on the main thread, in chunks, and
+chunks are sent to a process pool for pure-Python work (serialization,
+matrix math, diffing, etc):
+
+    >>> for result in gts.map_stacks(my_module.my_func, chunk_size=500):
+    ...     print(result)
+
+Functions run in the pool must be picklable, so defined at module level.
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+import collections
+import itertools
+import multiprocessing
+
+from .scene import iter_scene_nodes
+from .transform_stack import TransformStack
+
+
+def iter_chunks(iterable, size):
+    """Iterate over lists of `size` consecutive items of given iterable.
+
+    Args:
+        iterable (iterable):
+        size (int): Item count of each chunk, last one can be shorter.
+
+    Yields:
+        list:
+    """
+    it = iter(iterable)
+
+    while True:
+
+        chunk = list(itertools.islice(it, size))
+
+        if not chunk:
+            return
+
+        yield chunk
+
+
+def iter_stack_chunks(nodes=None, chunk_size=1000, skip_empty=False):
+    """Iterate over descriptions of transform stacks of many nodes, in
+    chunks.
+
+    Args:
+        nodes (iterable[guerilla.SceneGraphNode], optional): Nodes to
+          describe, every scene graph node of the document if not provided.
+        chunk_size (int, optional): Node count of each chunk.
+        skip_empty (bool, optional): Don't describe nodes without transform.
+
+    Yields:
+        list[dict]: `TransformStack.to_dict()` description of each node of
+          the chunk.
+    """
+    if nodes is None:
+        nodes = iter_scene_nodes()
+
+    stacks = (TransformStack(node) for node in nodes)
+
+    if skip_empty:
+        stacks = (ts for ts in stacks if not ts.is_empty)
+
+    for chunk in iter_chunks(stacks, chunk_size):
+        yield [ts.to_dict() for ts in chunk]
+
+
+def map_stacks(func, nodes=None, chunk_size=1000, max_workers=None,
+               max_pending=None, skip_empty=False, executor=None):
+    """Apply given function to chunks of transform stack descriptions in a
+    process pool.
+
+    Chunks are read on the calling thread while previous ones are processed.
+    Reading stops while `max_pending` chunks are waiting to be processed or
+    their result to be consumed, so memory usage doesn't depend on node
+    count.
+
+    Args:
+        func (callable): Picklable function called with a list of
+          `TransformStack.to_dict()` descriptions.
+        nodes (iterable[guerilla.SceneGraphNode], optional): Nodes to
+          process, every scene graph node of the document if not provided.
+        chunk_size (int, optional): Node count of each chunk.
+        max_workers (int, optional): Process count of the pool, CPU count if
+          not provided.
+        max_pending (int, optional): Maximum count of chunks submitted and
+          not consumed yet. Default to twice the process count.
+        skip_empty (bool, optional): Don't process nodes without transform.
+        executor (concurrent.futures.Executor, optional): Executor to use
+          instead of creating a process pool. It's not shut down.
+
+    Yields:
+        object: Result of `func` for each chunk, in chunk order.
+
+    Raises:
+        ValueError: If `max_pending` is lower than one.
+    """
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+
+    if max_pending is None:
+        max_pending = 2 * max_workers
+
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+
+    own_executor = executor is None
+
+    if own_executor:
+        # Python 2 needs the "futures" backport.
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers)
+
+    pending = collections.deque()
+
+    try:
+        for chunk in iter_stack_chunks(nodes, chunk_size, skip_empty):
+
+            # Backpressure: wait for the oldest chunk before reading more.
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+            pending.append(executor.submit(func, chunk))
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+        if own_executor:
+            executor.shutdown()
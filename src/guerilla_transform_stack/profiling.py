@@ -0,0 +1,338 @@
+"""
+This module contains instrumentation counting and timing Guerilla calls done
+by the package.
+
+Calls crossing into Guerilla (`Plug.getinput()`, `Plug.getoutputs()`,
+`Plug.get()`, `Plug.set()` and `getclassname()`) are the real cost of this
+package. `profile()` patches them, and every public method of the package,
+to count and time them per public method called:
+
+    >>> with gts.profile() as report:
+    ...     ts.add('euler')
+    >>> print(report)
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+import collections
+import contextlib
+import functools
+import inspect
+import timeit
+
+from .backend import get_backend, guerilla
+
+# Guerilla plug methods to instrument.
+PLUG_METHOD_NAMES = ('getinput', 'getoutputs', 'get', 'set')
+
+# Guerilla module functions to instrument.
+FUNCTION_NAMES = ('getclassname',)
+
+# Special methods instrumented as public API.
+_SPECIAL_METHOD_NAMES = ('__len__', '__iter__', '__getitem__',
+                         '__contains__')
+
+# Name of the public API method calls done outside of any public method are
+# attributed to.
+OUTSIDE = '<outside>'
+
+# Report of the current profile, None if not profiling.
+_report = None
+
+# Public API method names currently called, outer first.
+_api_stack = []
+
+
+class ProfileReport(object):
+    """Guerilla call counts and times per public API method.
+    """
+
+    def __init__(self):
+        # Call count and time of each (API method, Guerilla call) pair.
+        self.calls = collections.Counter()
+        self.times = collections.defaultdict(float)
+
+        # Call count and time of each API method.
+        self.api_calls = collections.Counter()
+        self.api_times = collections.defaultdict(float)
+
+    def __str__(self):
+        return self.format()
+
+    def by_api(self):
+        """Return Guerilla call counts and times grouped by API method.
+
+        Returns:
+            dict[str, dict]: 'calls' and 'time' of each API method, and
+              'guerilla_calls' and 'guerilla_time' dictionaries per Guerilla
+              call name.
+        """
+        result = {}
+
+        for api in set(self.api_calls) | {api for api, _ in self.calls}:
+            result[api] = {'calls': self.api_calls[api],
+                           'time': self.api_times[api],
+                           'guerilla_calls': {},
+                           'guerilla_time': {}}
+
+        for (api, name), count in self.calls.items():
+            result[api]['guerilla_calls'][name] = count
+            result[api]['guerilla_time'][name] = self.times[(api, name)]
+
+        return result
+
+    def format(self):
+        """Return report as a table, chattiest API methods first.
+
+        Returns:
+            str:
+        """
+        lines = ["{:<40} {:>8} {:>10} {:>10} {:>10}".format(
+            "API method", "calls", "time (s)", "guerilla", "g. time (s)")]
+
+        by_api = self.by_api()
+
+        for api, data in sorted(by_api.items(),
+                                key=lambda item: -sum(
+                                    item[1]['guerilla_calls'].values())):
+
+            lines.append("{:<40} {:>8} {:>10.6f} {:>10} {:>10.6f}".format(
+                api, data['calls'], data['time'],
+                sum(data['guerilla_calls'].values()),
+                sum(data['guerilla_time'].values())))
+
+            for name, count in sorted(data['guerilla_calls'].items()):
+                lines.append("    {:<36} {:>30} {:>10.6f}".format(
+                    name, count, data['guerilla_time'][name]))
+
+        return '\n'.join(lines)
+
+
+def _wrap_guerilla_call(func, name):
+    """Return function counting and timing calls of given Guerilla function.
+
+    Args:
+        func (callable): Guerilla function.
+        name (str): Name calls are reported under.
+
+    Returns:
+        callable:
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+
+        start = timeit.default_timer()
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            key = (_api_stack[0] if _api_stack else OUTSIDE, name)
+            _report.calls[key] += 1
+            _report.times[key] += timeit.default_timer() - start
+
+    return wrapper
+
+
+def _enter_api(name):
+    _api_stack.append(name)
+
+    return timeit.default_timer()
+
+
+def _exit_api(name, start):
+    _api_stack.pop()
+
+    # Only outer calls are reported: inner ones are part of them.
+    if not _api_stack:
+        _report.api_calls[name] += 1
+        _report.api_times[name] += timeit.default_timer() - start
+
+
+def _wrap_api(func, name):
+    """Return function attributing Guerilla calls to given API method.
+
+    Args:
+        func (callable): Public API function.
+        name (str): API method name.
+
+    Returns:
+        callable:
+    """
+    if inspect.isgeneratorfunction(func):
+
+        # Only attribute calls done while computing each item, not the ones
+        # done by the caller between items.
+        @functools.wraps(func)
+        def gen_wrapper(*args, **kwargs):
+
+            it = func(*args, **kwargs)
+
+            while True:
+
+                start = _enter_api(name)
+
+                try:
+                    value = next(it)
+                except StopIteration:
+                    return
+                finally:
+                    _exit_api(name, start)
+
+                yield value
+
+        return gen_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+
+        start = _enter_api(name)
+
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _exit_api(name, start)
+
+    return wrapper
+
+
+def _iter_subclasses(cls):
+    """Iterate over given class and its subclasses, recursively.
+
+    Args:
+        cls (type):
+
+    Yields:
+        type:
+    """
+    yield cls
+
+    for subclass in cls.__subclasses__():
+        for c in _iter_subclasses(subclass):
+            yield c
+
+
+def _api_patches():
+    """Return patches instrumenting public API of the package.
+
+    Returns:
+        list[tuple[object, str, object]]: Object, attribute name and
+          instrumented value.
+    """
+    import guerilla_transform_stack as package
+    from .transform import Transform
+    from .transform_stack import TransformStack
+
+    patches = []
+
+    classes = list(_iter_subclasses(TransformStack))
+    classes += list(_iter_subclasses(Transform))
+
+    for cls in classes:
+
+        for attr, value in list(vars(cls).items()):
+
+            if attr.startswith('_') and attr not in _SPECIAL_METHOD_NAMES:
+                continue
+
+            name = "{}.{}".format(cls.__name__, attr)
+
+            if isinstance(value, property):
+                value = property(_wrap_api(value.fget, name),
+                                 value.fset,
+                                 value.fdel,
+                                 value.__doc__)
+            elif isinstance(value, staticmethod):
+                value = staticmethod(_wrap_api(value.__func__, name))
+            elif isinstance(value, classmethod):
+                value = classmethod(_wrap_api(value.__func__, name))
+            elif inspect.isfunction(value):
+                value = _wrap_api(value, name)
+            else:
+                continue
+
+            patches.append((cls, attr, value))
+
+    # Public functions exposed by the package, in the package and in their
+    # own module so calls between them are instrumented too.
+    for attr in package.__all__:
+
+        func = getattr(package, attr)  # Load lazy attributes.
+
+        if not inspect.isfunction(func):
+            continue
+
+        module = inspect.getmodule(func)
+
+        if (module is None or
+                not module.__name__.startswith(package.__name__) or
+                module.__name__ == __name__):
+            continue
+
+        wrapper = _wrap_api(func, attr)
+
+        patches.append((package, attr, wrapper))
+        patches.append((module, func.__name__, wrapper))
+
+    return patches
+
+
+def _guerilla_patches():
+    """Return patches instrumenting Guerilla calls.
+
+    Returns:
+        list[tuple[object, str, object]]: Object, attribute name and
+          instrumented value.
+    """
+    patches = []
+
+    for cls in _iter_subclasses(guerilla.Plug):
+        for attr in PLUG_METHOD_NAMES:
+            if attr in vars(cls):
+                patches.append((cls, attr,
+                                _wrap_guerilla_call(vars(cls)[attr],
+                                                    'Plug.' + attr)))
+
+    module = get_backend()
+
+    for attr in FUNCTION_NAMES:
+        patches.append((module, attr,
+                        _wrap_guerilla_call(getattr(module, attr), attr)))
+
+    return patches
+
+
+@contextlib.contextmanager
+def profile():
+    """Count and time Guerilla calls per public API method in the block.
+
+    Yields:
+        ProfileReport: Report filled while the block runs.
+
+    Raises:
+        RuntimeError: If already profiling.
+    """
+    global _report
+
+    if _report is not None:
+        raise RuntimeError("already profiling")
+
+    patches = _api_patches() + _guerilla_patches()
+
+    originals = [(obj, attr, vars(obj)[attr]) for obj, attr, _ in patches]
+
+    _report = ProfileReport()
+
+    for obj, attr, value in patches:
+        setattr(obj, attr, value)
+
+    try:
+        yield _report
+    finally:
+        for obj, attr, value in reversed(originals):
+            setattr(obj, attr, value)
+
+        del _api_stack[:]
+
+        _report = None
@@ -0,0 +1,114 @@
+"""
+This module contains functions processing transform stacks of many nodes.
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+from .backend import guerilla
+from .transform_stack import (get_transform_class,
+                              iter_transforms,
+                              type_name_to_class)
+
+
+def _guerilla_type_names(types):
+    """Return Guerilla type names from transform type names.
+
+    Args:
+        types (list[str]): Transform type names ('euler', 'target', etc).
+
+    Returns:
+        set[str]: Guerilla type names ('TransformEuler', etc).
+
+    Raises:
+        ValueError: If a transform type is invalid.
+    """
+    try:
+        return {type_name_to_class[type_].guerilla_type_name()
+                for type_ in types}
+    except KeyError:
+        raise ValueError("invalid transform type argument")
+
+
+def iter_stacks(nodes, types=None, strict=True):
+    """Iterate over transforms of given nodes.
+
+    Transforms are wrapped only if they match given `types`, without
+    building a `TransformStack` per node.
+
+    Args:
+        nodes (iterable[guerilla.SceneGraphNode]): Scene graph nodes.
+        types (list[str], optional): Transform type names to keep ('euler',
+          'target', etc). All transforms are kept if not provided.
+        strict (bool, optional): Raise on transform nodes of unregistered
+          types instead of wrapping them by `TransformUnknown`.
+
+    Yields:
+        tuple[guerilla.SceneGraphNode, list[Transform]]: Node and its
+          transforms, from bottom to top.
+    """
+    if types is not None:
+        types = _guerilla_type_names(types)
+
+    for node in nodes:
+
+        transforms = []
+
+        for transform_node in iter_transforms(node):
+
+            class_name = guerilla.getclassname(transform_node)
+
+            if types is not None and class_name not in types:
+                continue
+
+            transforms.append(
+                get_transform_class(class_name, strict)(transform_node))
+
+        yield node, transforms
+
+
+def iter_scene_nodes(root=None):
+    """Iterate over scene graph nodes of given hierarchy.
+
+    Args:
+        root (guerilla.Node, optional): Root node of the hierarchy,
+          Guerilla document if not provided.
+
+    Yields:
+        guerilla.SceneGraphNode:
+    """
+    if root is None:
+        root = guerilla.Document()
+
+    if isinstance(root, guerilla.SceneGraphNode):
+        yield root
+
+    for node in root.children(type='SceneGraphNode', recursive=True):
+        yield node
+
+
+def collect_stacks(root=None, types=None, skip_empty=False, strict=True):
+    """Iterate over transforms of every scene graph node of given hierarchy.
+
+    Args:
+        root (guerilla.Node, optional): Root node of the hierarchy,
+          Guerilla document if not provided.
+        types (list[str], optional): Transform type names to keep ('euler',
+          'target', etc). All transforms are kept if not provided.
+        skip_empty (bool, optional): Don't yield nodes without transform
+          (after filtering).
+        strict (bool, optional): Raise on transform nodes of unregistered
+          types instead of wrapping them by `TransformUnknown`.
+
+    Yields:
+        tuple[guerilla.SceneGraphNode, list[Transform]]: Node and its
+          transforms, from bottom to top.
+    """
+    for node, transforms in iter_stacks(iter_scene_nodes(root), types,
+                                        strict):
+
+        if skip_empty and not transforms:
+            continue
+
+        yield node, transforms
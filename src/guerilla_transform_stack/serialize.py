@@ -0,0 +1,141 @@
+"""
+This module contains functions to save and load transform stacks of many
+nodes.
+
+Transform stacks are stored as JSON lines: one `TransformStack.to_dict()`
+description per line.
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+import gzip
+import json
+
+from .backend import guerilla
+from .scene import iter_scene_nodes
+from .tracking import mark_changed
+from .transform import get_top_transform_plug
+from .transform_stack import TransformStack, _build_transforms
+
+
+def _to_json_line(ts):
+    """Return JSON line describing given transform stack.
+
+    Args:
+        ts (TransformStack):
+
+    Returns:
+        str: JSON description, ending with a new line.
+    """
+    return json.dumps(ts.to_dict(), separators=(',', ':')) + '\n'
+
+
+def dump_stacks(stacks, f):
+    """Write description of given transform stacks as JSON lines.
+
+    Args:
+        stacks (iterable[TransformStack]): Transform stacks to write.
+        f (file): Text file object to write to.
+    """
+    for ts in stacks:
+        f.write(_to_json_line(ts))
+
+
+def export_stacks(dst, nodes=None, compress=None, chunk_size=1000,
+                  skip_empty=False):
+    """Stream description of transform stacks of many nodes as JSON lines.
+
+    Each node transform stack is described and written as soon as it's
+    iterated, so memory usage doesn't depend on node count.
+
+    Args:
+        dst (str|file): Path of the file to write, or binary file object
+          (like a pipe).
+        nodes (iterable[guerilla.SceneGraphNode], optional): Nodes to
+          export, every scene graph node of the document if not provided.
+        compress (bool, optional): Compress output using gzip. Default to
+          True if `dst` is a path ending with '.gz'.
+        chunk_size (int, optional): Flush output every `chunk_size` written
+          nodes.
+        skip_empty (bool, optional): Don't write nodes without transform.
+
+    Returns:
+        int: Written node count.
+    """
+    if nodes is None:
+        nodes = iter_scene_nodes()
+
+    is_path = not hasattr(dst, 'write')
+
+    if compress is None:
+        compress = is_path and dst.endswith('.gz')
+
+    if is_path:
+        f = open(dst, 'wb')
+    else:
+        f = dst
+
+    out = gzip.GzipFile(fileobj=f, mode='wb') if compress else f
+
+    count = 0
+
+    try:
+        for node in nodes:
+
+            ts = TransformStack(node)
+
+            if skip_empty and ts.is_empty:
+                continue
+
+            out.write(_to_json_line(ts).encode('utf-8'))
+
+            count += 1
+
+            if count % chunk_size == 0:
+                out.flush()
+    finally:
+        if compress:
+            out.close()  # Write gzip trailer, doesn't close `f`.
+        if is_path:
+            f.close()
+        else:
+            f.flush()
+
+    return count
+
+
+def load_stacks(f):
+    """Create transforms described in JSON lines in a single Guerilla
+    modifier.
+
+    Transforms are added on top of existing ones.
+
+    Args:
+        f (file): Text file object written by `dump_stacks()`.
+
+    Returns:
+        list[TransformStack]: Transform stacks of each described node.
+    """
+    stacks = []
+
+    with guerilla.Modifier() as mod:
+
+        for line in f:
+
+            if not line.strip():
+                continue
+
+            data = json.loads(line)
+
+            node = guerilla.pynode(data['node'])
+
+            transforms = _build_transforms(node, mod, data['transforms'],
+                                           get_top_transform_plug(node))
+
+            mark_changed(node.path, [t.node.name for t in transforms])
+
+            stacks.append(TransformStack(node))
+
+    return stacks
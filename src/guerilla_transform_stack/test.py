@@ -1,15 +1,50 @@
 """
-This module is means to be executed inside Guerilla.
+This module is means to be executed inside Guerilla, or outside of it using
+the fake Guerilla backend:
+
+    $ GUERILLA_TRANSFORM_STACK_BACKEND=fake python -m unittest \
+        guerilla_transform_stack.test
 """
 
 import unittest
 
 
+def _transform_names(descriptions):
+    """Return transform names of given stack descriptions (run in a process
+    pool by `test_map_stacks()`).
+    """
+    return [[t['name'] for t in data['transforms']] for data in descriptions]
+
+
+def _has_module(name):
+    """Return whether given module can be imported, without importing it.
+    """
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        # Python 2.
+        from pkgutil import find_loader as find_spec
+
+    try:
+        return find_spec(name) is not None
+    except ImportError:
+        # Parent package is missing.
+        return False
+
+
+def _guerilla_calls(report, name):
+    """Return count of given Guerilla call in a profile report, whatever the
+    API method calling it.
+    """
+    return sum(count for (_, call_name), count in report.calls.items()
+               if call_name == name)
+
+
 class TestGuerillaTransformStack(unittest.TestCase):
 
     def test_all(self):
 
-        import guerilla
+        from guerilla_transform_stack.backend import guerilla
         import guerilla_transform_stack as gts
 
         with guerilla.Modifier() as mod:
@@ -92,7 +127,7 @@ class TestGuerillaTransformStack(unittest.TestCase):
 
     def test_target(self):
 
-        import guerilla
+        from guerilla_transform_stack.backend import guerilla
         import guerilla_transform_stack as gts
 
         with guerilla.Modifier() as mod:
@@ -152,7 +187,7 @@ class TestGuerillaTransformStack(unittest.TestCase):
 
     def test_baked(self):
 
-        import guerilla
+        from guerilla_transform_stack.backend import guerilla
         import guerilla_transform_stack as gts
 
         with guerilla.Modifier() as mod:
@@ -210,7 +245,7 @@ class TestGuerillaTransformStack(unittest.TestCase):
 
     def test_constraint(self):
 
-        import guerilla
+        from guerilla_transform_stack.backend import guerilla
         import guerilla_transform_stack as gts
 
         with guerilla.Modifier() as mod:
@@ -304,7 +339,7 @@ class TestGuerillaTransformStack(unittest.TestCase):
 
     def test_shake(self):
 
-        import guerilla
+        from guerilla_transform_stack.backend import guerilla
         import guerilla_transform_stack as gts
 
         with guerilla.Modifier() as mod:
@@ -362,6 +397,1348 @@ class TestGuerillaTransformStack(unittest.TestCase):
 
         self.assertTrue(list(ts), [t_shake1, t_shake2])
 
+    def test_cached(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOCached", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node, cached=True)
+
+        self.assertEqual(len(ts), 0)
+        self.assertTrue(ts.is_empty)
+
+        with self.assertRaises(ValueError):
+            _ = ts.top
+
+        t_euler1 = ts.add('euler', "my_euler1")
+        t_euler2 = ts.add('euler', "my_euler2")
+        t_euler3 = ts.add('euler', "my_euler3")
+
+        self.assertEqual(len(ts), 3)
+        self.assertEqual(list(ts), [t_euler1, t_euler2, t_euler3])
+        self.assertEqual(ts["my_euler2"], t_euler2)
+        self.assertEqual(ts.top, t_euler3)
+        self.assertEqual(ts.bottom, t_euler1)
+
+        t_euler3.move_bottom()
+
+        self.assertEqual(list(ts), [t_euler3, t_euler1, t_euler2])
+        self.assertEqual(ts.top, t_euler2)
+
+        t_euler1.delete()
+
+        self.assertEqual(list(ts), [t_euler3, t_euler2])
+
+        # Modification outside the transform stack object.
+        ts.top.node.movedown()
+
+        self.assertEqual(list(ts), [t_euler3, t_euler2])
+
+        ts.refresh()
+
+        self.assertEqual(list(ts), [t_euler2, t_euler3])
+
+    def test_indexing(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOIndexing", "SceneGraphNode")
+
+        for cached in (False, True):
+
+            ts = gts.TransformStack(foo_node, cached=cached)
+
+            self.assertNotIn("my_euler", ts)
+            self.assertIsNone(ts.get("my_euler"))
+
+            with self.assertRaises(IndexError):
+                _ = ts[0]
+
+            t_euler = ts.add('euler', "my_euler")
+            t_shake = ts.add('shake', "my_shake")
+
+            self.assertIn("my_euler", ts)
+            self.assertIn(t_shake, ts)
+            self.assertEqual(ts.get("my_shake"), t_shake)
+            self.assertEqual(ts.get("nope", 42), 42)
+            self.assertEqual(ts[0], t_euler)
+            self.assertEqual(ts[1], t_shake)
+            self.assertEqual(ts[-1], t_shake)
+            self.assertEqual(ts[:], [t_euler, t_shake])
+            self.assertEqual(ts[1:], [t_shake])
+
+            with self.assertRaises(IndexError):
+                _ = ts[2]
+
+            with self.assertRaises(KeyError):
+                _ = ts["nope"]
+
+            t_shake.delete()
+            t_euler.delete()
+
+    def test_add_many(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOAddMany", "SceneGraphNode")
+            bar_node = mod.createnode("BARAddMany", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node)
+
+        t_euler, t_shake = ts.add_many([('euler', "my_euler"),
+                                        ('shake', None)])
+
+        self.assertEqual(list(ts), [t_euler, t_shake])
+        self.assertEqual(t_shake.node.name, "Shake")
+
+        with self.assertRaises(ValueError):
+            ts.add_many([('euler', None), ('nope', None)])
+
+        self.assertEqual(len(ts), 2)
+
+        (foo_transforms,
+         bar_transforms) = gts.bulk_add([foo_node, bar_node],
+                                        [('target', "my_target"),
+                                         ('baked', "my_baked")])
+
+        self.assertEqual(list(ts), [t_euler, t_shake] + foo_transforms)
+        self.assertEqual(list(gts.TransformStack(bar_node)), bar_transforms)
+        self.assertIsInstance(bar_transforms[1], gts.transform.TransformBaked)
+
+    def test_scene(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOScene", "SceneGraphNode")
+            bar_node = mod.createnode("BARScene", "SceneGraphNode", foo_node)
+            baz_node = mod.createnode("BAZScene", "SceneGraphNode", bar_node)
+
+        foo_ts = gts.TransformStack(foo_node)
+        bar_ts = gts.TransformStack(bar_node)
+
+        foo_transforms = foo_ts.add_many([('euler', None), ('shake', None)])
+        bar_transforms = bar_ts.add_many([('shake', None), ('euler', None)])
+
+        self.assertEqual(list(gts.iter_stacks([foo_node, baz_node])),
+                         [(foo_node, foo_transforms), (baz_node, [])])
+
+        self.assertEqual(list(gts.collect_stacks(foo_node)),
+                         [(foo_node, foo_transforms),
+                          (bar_node, bar_transforms),
+                          (baz_node, [])])
+
+        self.assertEqual(list(gts.collect_stacks(foo_node, types=['euler'],
+                                                 skip_empty=True)),
+                         [(foo_node, foo_transforms[:1]),
+                          (bar_node, bar_transforms[1:])])
+
+        with self.assertRaises(ValueError):
+            list(gts.iter_stacks([foo_node], types=['nope']))
+
+    def test_evaluate(self):
+
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy is not available")
+
+        import math
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOEvaluate", "SceneGraphNode")
+            bar_node = mod.createnode("BAREvaluate", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node)
+
+        t_euler1, _, t_euler2 = ts.add_many([('euler', None),
+                                             ('shake', None),
+                                             ('euler', None)])
+
+        plugs = (t_euler1.node.SX, t_euler1.node.RY, t_euler1.node.TZ,
+                 t_euler2.node.RX, t_euler2.node.TX)
+
+        for plug, value in zip(plugs, (2.0, 45.0, 3.0, 30.0, 1.0)):
+            plug.set(value)
+
+        matrices = ts.evaluate()
+
+        self.assertEqual(matrices.shape, (3, 4, 4))
+        self.assertTrue(numpy.allclose(matrices[1], numpy.eye(4)))
+        mtx = guerilla.matrix.createcomposite(2.0, 1.0, 1.0,
+                                              0.0, math.radians(45.0), 0.0,
+                                              0.0, 0.0, 3.0)
+
+        self.assertTrue(numpy.allclose(matrices[0],
+                                       numpy.reshape(mtx.asarray(), (4, 4))))
+
+        node_mtx = numpy.reshape(foo_node.getmatrix().asarray(), (4, 4))
+
+        self.assertTrue(numpy.allclose(ts.evaluate(accumulate=True)[-1],
+                                       node_mtx))
+
+        matrices = gts.evaluate_many([ts, gts.TransformStack(bar_node)])
+
+        self.assertEqual(matrices.shape, (2, 4, 4))
+        self.assertTrue(numpy.allclose(matrices[0], node_mtx))
+        self.assertTrue(numpy.allclose(matrices[1], numpy.eye(4)))
+
+        # World matrices, parent evaluated once for both children.
+        with guerilla.Modifier() as mod:
+            parent_node = mod.createnode("PARENTEvaluate", "SceneGraphNode")
+            child_node = mod.createnode("CHILDEvaluate", "SceneGraphNode",
+                                        parent_node)
+            empty_node = mod.createnode("EMPTYEvaluate", "SceneGraphNode",
+                                        parent_node)
+
+        gts.TransformStack(parent_node).add('euler').node.TX.set(5.0)
+        child_ts = gts.TransformStack(child_node)
+        child_ts.add('euler').node.TY.set(1.0)
+        empty_node.Transform.set(guerilla.transform(
+            guerilla.matrix.createcomposite(1, 1, 1, 0, 0, 0, 0, 0, 2)
+            .asarray()))
+
+        matrices = gts.evaluate_many([child_ts,
+                                      gts.TransformStack(empty_node)],
+                                     world=True)
+
+        numpy.testing.assert_allclose(matrices[:, 3, :3],
+                                      [[5.0, 1.0, 0.0], [5.0, 0.0, 2.0]])
+        self.assertTrue(numpy.allclose(
+            matrices[0],
+            numpy.reshape(child_node.getworldmatrix().asarray(), (4, 4))))
+        self.assertTrue(numpy.allclose(
+            child_ts.evaluate(accumulate=True, world=True)[-1], matrices[0]))
+
+    def test_bake(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOBake", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node)
+
+        t_euler1, t_euler2 = ts.add_many([('euler', None), ('euler', None)])
+
+        t_euler1.node.TX.setkey(1, 0.0)
+        t_euler1.node.TX.setkey(3, 2.0)
+        t_euler2.node.TY.set(5.0)
+
+        doc = guerilla.Document()
+        cur_frame = doc.getframe()
+
+        expected = []
+
+        for frame in (1, 2, 3):
+            doc.setframe(frame)
+            expected.append(foo_node.getmatrix().asarray())
+
+        doc.setframe(cur_frame)
+
+        t_baked = ts.bake(range(1, 4), "my_baked")
+
+        self.assertEqual(doc.getframe(), cur_frame)
+        self.assertEqual(list(ts), [t_baked])
+        self.assertEqual(t_baked.node.name, "my_baked")
+        self.assertTrue(t_baked.is_alone)
+
+        for frame, values in zip((1, 2, 3), expected):
+            doc.setframe(frame)
+            for a, b in zip(foo_node.getmatrix().asarray(), values):
+                self.assertAlmostEqual(a, b, places=6)
+
+        doc.setframe(cur_frame)
+
+        # Baking a stack with a baked transform gives the same matrices.
+        t_baked2, = gts.bake_many([ts], [1, 2, 3])
+
+        self.assertEqual(list(ts), [t_baked2])
+
+        for frame, values in zip((1, 2, 3), expected):
+            doc.setframe(frame)
+            for a, b in zip(foo_node.getmatrix().asarray(), values):
+                self.assertAlmostEqual(a, b, places=6)
+
+        doc.setframe(cur_frame)
+
+    def test_flatten(self):
+
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy is not available")
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOFlatten", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node)
+
+        (t_euler1, t_euler2, t_shake,
+         t_euler3, t_euler4, t_euler5) = ts.add_many([('euler', "my_euler1"),
+                                                      ('euler', "my_euler2"),
+                                                      ('shake', None),
+                                                      ('euler', "my_euler3"),
+                                                      ('euler', "my_euler4"),
+                                                      ('euler', "my_euler5")])
+
+        t_euler1.node.TX.set(1.0)
+        t_euler2.node.RY.set(90.0)
+        t_euler2.node.SZ.set(2.0)
+        t_euler4.node.TY.setkey(1, 0.0)
+        t_euler4.node.TY.setkey(2, 1.0)
+        t_euler5.node.RX.set(10.0)
+
+        expected = numpy.reshape(foo_node.getmatrix().asarray(), (4, 4))
+
+        # Animated run is kept without frames.
+        t_euler12, = ts.flatten()
+
+        self.assertEqual(list(ts), [t_euler12, t_shake,
+                                    t_euler3, t_euler4, t_euler5])
+        self.assertIsInstance(t_euler12, gts.transform.TransformEuler)
+        self.assertEqual(t_euler12.node.name, "my_euler1")
+        self.assertTrue(numpy.allclose(
+            numpy.reshape(foo_node.getmatrix().asarray(), (4, 4)), expected))
+
+        t_baked, = ts.flatten(keep=["my_euler5"], frames=[1, 2])
+
+        self.assertEqual(list(ts), [t_euler12, t_shake, t_baked, t_euler5])
+        self.assertIsInstance(t_baked, gts.transform.TransformBaked)
+        self.assertTrue(numpy.allclose(
+            numpy.reshape(foo_node.getmatrix().asarray(), (4, 4)), expected))
+
+        self.assertEqual(ts.flatten(), [])
+
+        # Non-uniform scale on top of a rotation gives shear, which a single
+        # transform can't hold.
+        with guerilla.Modifier() as mod:
+            bar_node = mod.createnode("BARFlatten", "SceneGraphNode")
+
+        ts = gts.TransformStack(bar_node)
+
+        t_euler1, t_euler2 = ts.add_many([('euler', "my_euler1"),
+                                          ('euler', "my_euler2")])
+
+        t_euler1.node.RZ.set(45.0)
+        t_euler2.node.SX.set(3.0)
+
+        expected = numpy.reshape(bar_node.getmatrix().asarray(), (4, 4))
+
+        self.assertEqual(ts.flatten(), [])
+        self.assertEqual(list(ts), [t_euler1, t_euler2])
+        self.assertTrue(numpy.allclose(
+            numpy.reshape(bar_node.getmatrix().asarray(), (4, 4)), expected))
+
+        t_euler2.node.SX.setkey(1, 1.0)
+        t_euler2.node.SX.setkey(2, 3.0)
+
+        expected = numpy.reshape(bar_node.getmatrix().asarray(), (4, 4))
+
+        self.assertEqual(ts.flatten(frames=[1, 2]), [])
+        self.assertEqual(list(ts), [t_euler1, t_euler2])
+
+        # Connected plugs are not flattened, their connection would be lost.
+        with guerilla.Modifier() as mod:
+            baz_node = mod.createnode("BAZFlatten", "SceneGraphNode")
+            driver_node = mod.createnode("BAZFlattenDriver", "SceneGraphNode")
+
+        t_driver = gts.TransformStack(driver_node).add('euler')
+
+        ts = gts.TransformStack(baz_node)
+
+        t_euler1, t_euler2, t_euler3, t_euler4 = ts.add_many(
+            [('euler', None), ('euler', None), ('euler', None),
+             ('euler', None)])
+
+        t_euler3.node.TX.set(1.0)
+        t_euler4.node.TX.set(2.0)
+
+        with guerilla.Modifier() as mod:
+            mod.connect(t_euler2.node.TX, t_driver.node.TX)
+
+        t_euler34, = ts.flatten()
+
+        self.assertEqual(list(ts), [t_euler1, t_euler2, t_euler34])
+        self.assertEqual(t_euler34.get_srt()[6], 3.0)
+        self.assertIs(t_euler2.node.TX.getinput(), t_driver.node.TX)
+
+        # Driving plugs neither.
+        ts.add('euler')
+
+        with guerilla.Modifier() as mod:
+            mod.connect(t_driver.node.TY, t_euler34.node.TY)
+
+        self.assertEqual(ts.flatten(), [])
+
+    def test_serialize(self):
+
+        import io
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOSerialize", "SceneGraphNode")
+            bar_node = mod.createnode("BARSerialize", "SceneGraphNode")
+            baz_node = mod.createnode("BAZSerialize", "SceneGraphNode")
+            constraint_node = mod.createnode("FOOSerializeConstraintNode",
+                                             "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node)
+
+        t_euler, t_target, t_constraint, _, t_baked = ts.add_many(
+            [('euler', "my_euler"),
+             ('target', "my_target"),
+             ('constraint', "my_constraint"),
+             ('shake', "my_shake"),
+             ('baked', "my_baked")])
+
+        t_euler.node.TX.set(2.0)
+        t_euler.node.RZ.set(45.0)
+        t_euler.node.TY.setkey(1, 0.0)
+        t_euler.node.TY.setkey(10, 5.0)
+        t_target.target.Transform.set(guerilla.transform(
+            guerilla.matrix.createcomposite(1, 1, 1, 0, 0, 0, 3, 4, 5)
+            .asarray()))
+        t_constraint.add(constraint_node)
+        t_constraint.weight_plug(constraint_node).set(0.5)
+        t_baked.set_samples([1, 2], [(1, 1, 1, 0, 0, 0, 0, 0, 0),
+                                     (1, 1, 1, 0, 0, 0, 0, 3, 0)])
+
+        data = ts.to_dict()
+
+        self.assertEqual(data['node'], "FOOSerialize")
+        self.assertEqual([(t['type'], t['name']) for t in data['transforms']],
+                         [('euler', "my_euler"),
+                          ('target', "my_target"),
+                          ('constraint', "my_constraint"),
+                          ('shake', "my_shake"),
+                          ('baked', "my_baked")])
+        self.assertEqual(data['transforms'][2]['objects'],
+                         ["FOOSerializeConstraintNode"])
+        self.assertEqual(data['transforms'][2]['weights'], [0.5])
+        self.assertEqual(data['transforms'][4]['keys']['TY'],
+                         [[1, 0.0], [2, 3.0]])
+        self.assertEqual(data['transforms'][0]['keys'],
+                         {'TY': [[1, 0.0], [10, 5.0]]})
+
+        bar_ts = gts.TransformStack.from_dict(data, bar_node)
+
+        bar_data = bar_ts.to_dict()
+
+        self.assertEqual(bar_data['node'], "BARSerialize")
+        self.assertEqual(bar_data['transforms'], data['transforms'])
+        self.assertTrue(bar_ts["my_euler"].node.TY.isanimated())
+
+        f = io.StringIO()
+
+        gts.dump_stacks([ts], f)
+
+        self.assertEqual(len(f.getvalue().splitlines()), 1)
+
+        f = io.StringIO(f.getvalue().replace('"FOOSerialize"',
+                                             '"BAZSerialize"'))
+
+        baz_ts, = gts.load_stacks(f)
+
+        self.assertIs(baz_ts.node, baz_node)
+        self.assertEqual(baz_ts.to_dict()['transforms'], data['transforms'])
+
+    def test_export(self):
+
+        import gzip
+        import io
+        import json
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOExport", "SceneGraphNode")
+            bar_node = mod.createnode("BARExport", "SceneGraphNode", foo_node)
+            baz_node = mod.createnode("BAZExport", "SceneGraphNode", foo_node)
+
+        gts.bulk_add([foo_node, baz_node], [('euler', None), ('shake', None)])
+
+        nodes = list(gts.scene.iter_scene_nodes(foo_node))
+
+        f = io.BytesIO()
+
+        self.assertEqual(gts.export_stacks(f, nodes, chunk_size=1), 3)
+
+        records = [json.loads(line.decode('utf-8'))
+                   for line in f.getvalue().splitlines()]
+
+        self.assertEqual([r['node'] for r in records],
+                         [foo_node.path, bar_node.path, baz_node.path])
+        self.assertEqual(records[0],
+                         gts.TransformStack(foo_node).to_dict())
+
+        f = io.BytesIO()
+
+        self.assertEqual(gts.export_stacks(f, nodes, compress=True,
+                                           skip_empty=True), 2)
+
+        with gzip.GzipFile(fileobj=io.BytesIO(f.getvalue())) as gz:
+            lines = gz.read().decode('utf-8').splitlines()
+
+        self.assertEqual([json.loads(line)['node'] for line in lines],
+                         [foo_node.path, baz_node.path])
+
+    def test_backend(self):
+
+        from guerilla_transform_stack import backend
+
+        self.assertIs(backend.load_backend('fake'),
+                      __import__('guerilla_transform_stack.fake_guerilla',
+                                 fromlist=['fake_guerilla']))
+
+        with self.assertRaises(ValueError):
+            backend.load_backend('nope')
+
+        backend.register_backend('nope', 'guerilla_transform_stack.'
+                                         'fake_guerilla')
+
+        try:
+            self.assertIs(backend.load_backend('nope'),
+                          backend.load_backend('fake'))
+        finally:
+            del backend.backends['nope']
+
+    def test_profile(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOProfile", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node)
+
+        add = vars(gts.TransformStack)['add']
+        bulk_add = gts.bulk_add
+
+        with gts.profile() as report:
+
+            t_euler = ts.add('euler')
+            self.assertEqual(len(ts), 1)
+
+            for t in ts:
+                self.assertFalse(t.is_on_middle)
+
+            gts.bulk_add([foo_node], [('shake', None)])
+
+        # Unbound methods are created on each access in Python 2.
+        self.assertIs(vars(gts.TransformStack)['add'], add)
+        self.assertIs(gts.bulk_add, bulk_add)
+
+        self.assertEqual(report.api_calls['TransformStack.add'], 1)
+        self.assertEqual(report.api_calls['bulk_add'], 1)
+        self.assertEqual(report.api_calls['Transform.is_on_middle'], 1)
+
+        # Inner calls are attributed to the outer public method.
+        self.assertNotIn('TransformStack.add_many', report.api_calls)
+
+        self.assertEqual(report.calls[('TransformStack.__len__',
+                                       'Plug.getinput')], 2)
+        self.assertEqual(report.calls[('TransformStack.__iter__',
+                                       'Plug.getinput')], 2)
+        self.assertEqual(report.calls[('Transform.is_on_middle',
+                                       'Plug.getinput')], 1)
+        self.assertIn('TransformStack.add', report.by_api())
+        self.assertIn('TransformStack.add', str(report))
+
+        self.assertEqual(t_euler, ts.bottom)
+
+        with gts.profile():
+            with self.assertRaises(RuntimeError):
+                with gts.profile():
+                    pass
+
+    def test_reorder(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOReorder", "SceneGraphNode")
+
+        for cached in (False, True):
+
+            ts = gts.TransformStack(foo_node, cached=cached)
+
+            t1, t2, t3, t4 = ts.add_many([('euler', "my_euler1"),
+                                          ('euler', "my_euler2"),
+                                          ('shake', "my_shake3"),
+                                          ('euler', "my_euler4")])
+
+            t1.move_to(2)
+            self.assertEqual(list(ts), [t2, t3, t1, t4])
+
+            t4.move_to(-3)
+            self.assertEqual(list(ts), [t2, t4, t3, t1])
+
+            t1.move_bottom()
+            self.assertEqual(list(ts), [t1, t2, t4, t3])
+            self.assertTrue(t1.is_on_bottom)
+
+            t2.move_top()
+            self.assertEqual(list(ts), [t1, t4, t3, t2])
+            self.assertTrue(t2.is_on_top)
+
+            with self.assertRaises(IndexError):
+                t2.move_to(4)
+
+            ts.reorder(["my_euler4", t3, "my_euler1", t2])
+            self.assertEqual(list(ts), [t4, t3, t1, t2])
+
+            ts.reorder([t1, t2, t3, t4])
+            self.assertEqual(list(ts), [t1, t2, t3, t4])
+            self.assertEqual(len(gts.TransformStack(foo_node)), 4)
+
+            # Every transform only feeds the one below it.
+            for t in ts:
+                self.assertEqual(len(t.node.Out.getoutputs()), 1)
+
+            with self.assertRaises(ValueError):
+                ts.reorder([t1, t2, t3])
+
+            with self.assertRaises(ValueError):
+                ts.reorder([t1, t2, t3, t3])
+
+            for t in list(ts):
+                t.delete()
+
+    def test_position(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOPosition", "SceneGraphNode")
+
+        for cached in (False, True):
+
+            ts = gts.TransformStack(foo_node, cached=cached)
+
+            t1 = ts.add('euler')
+
+            self.assertEqual(t1.position, (0, 1, True, True, False))
+            self.assertTrue(t1.is_alone)
+
+            t2, t3 = ts.add_many([('euler', None), ('euler', None)])
+
+            self.assertEqual(t1.position, (0, 3, False, True, False))
+            self.assertEqual(t2.position, (1, 3, False, False, True))
+            self.assertEqual(t3.position.index, 2)
+            self.assertTrue(t3.position.is_on_top)
+            self.assertFalse(t1.is_alone)
+
+            # Transform from a plain stack object.
+            self.assertEqual(gts.TransformStack(foo_node)[1].position,
+                             t2.position)
+
+            for t in list(ts):
+                t.delete()
+
+            if cached:
+                with self.assertRaises(ValueError):
+                    _ = t1.position
+
+    def test_flyweight(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOFlyweight", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node, cached=True)
+
+        t_euler, t_shake = ts.add_many([('euler', None), ('shake', None)])
+
+        self.assertFalse(hasattr(t_euler, '__dict__'))
+
+        self.assertIs(ts.bottom, t_euler)
+        self.assertIs(ts.top, t_shake)
+        self.assertIs(ts["Shake"], t_shake)
+        self.assertEqual([id(t) for t in ts], [id(t_euler), id(t_shake)])
+
+        other_t_euler = gts.TransformStack(foo_node).bottom
+
+        self.assertIsNot(other_t_euler, t_euler)
+        self.assertEqual(other_t_euler, t_euler)
+        self.assertNotEqual(other_t_euler, t_shake)
+        self.assertNotEqual(t_euler, None)
+        self.assertEqual(hash(other_t_euler), hash(t_euler))
+        self.assertEqual(len({t_euler, t_shake, other_t_euler}), 2)
+        self.assertEqual({t_euler: 1}[other_t_euler], 1)
+
+    def test_constraint_bulk(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            nodes = [mod.createnode("FOOConstraintBulk{}".format(i),
+                                    "SceneGraphNode")
+                     for i in range(3)]
+            drivers = [mod.createnode("FOOConstraintBulkDriver{}".format(i),
+                                      "SceneGraphNode")
+                       for i in range(2)]
+
+        ts = gts.TransformStack(nodes[0])
+
+        t_constraint = ts.add('constraint')
+        t_constraint.add_many(drivers, [0.25, 0.75])
+
+        self.assertEqual(t_constraint.objects, drivers)
+        self.assertEqual(t_constraint.weights, [0.25, 0.75])
+
+        t_constraint.set_weights({drivers[1]: 0.5})
+
+        self.assertEqual(t_constraint.weights, [0.25, 0.5])
+
+        t_constraint.remove(drivers[0])
+
+        self.assertEqual(t_constraint.objects, [drivers[1]])
+        self.assertEqual(t_constraint.weights, [0.5])
+
+        # Removed node can be added again.
+        t_constraint.add(drivers[0])
+
+        self.assertEqual(t_constraint.objects, [drivers[1], drivers[0]])
+        self.assertEqual(t_constraint.weights, [0.5, 1.0])
+
+        constraints = gts.constrain_many(nodes[1:],
+                                         [drivers] * 2,
+                                         [0.5, [0.1, 0.2]],
+                                         name="my_constraint")
+
+        self.assertEqual([t.node.name for t in constraints],
+                         ["my_constraint"] * 2)
+
+        for node, constraint in zip(nodes[1:], constraints):
+            self.assertEqual(gts.TransformStack(node).top, constraint)
+            self.assertEqual(constraint.objects, drivers)
+
+        self.assertEqual(constraints[0].weights, [0.5, 0.5])
+        self.assertEqual(constraints[1].weights, [0.1, 0.2])
+
+    def test_map_stacks(self):
+
+        # Python 2 needs the "futures" backport.
+        if not _has_module('concurrent.futures'):
+            self.skipTest("concurrent.futures is not available")
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            nodes = [mod.createnode("FOOMapStacks{}".format(i),
+                                    "SceneGraphNode")
+                     for i in range(5)]
+
+        gts.bulk_add(nodes, [('euler', "my_euler"), ('shake', "my_shake")])
+
+        chunks = list(gts.iter_stack_chunks(nodes, chunk_size=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(chunks[2][0]['node'], "FOOMapStacks4")
+
+        results = list(gts.map_stacks(_transform_names, nodes,
+                                      chunk_size=2,
+                                      max_workers=2,
+                                      max_pending=1))
+
+        self.assertEqual(results,
+                         [[["my_euler", "my_shake"]] * 2] * 2 +
+                         [[["my_euler", "my_shake"]]])
+
+        with self.assertRaises(ValueError):
+            list(gts.map_stacks(_transform_names, nodes, max_pending=0))
+
+    def test_diff(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOODiff", "SceneGraphNode")
+            bar_node = mod.createnode("BARDiff", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node)
+        ts.add_many([('euler', "a"), ('target', "b"), ('constraint', "c"),
+                     ('shake', "d")])
+
+        other = gts.TransformStack(bar_node)
+        other.add_many([('shake', "d"), ('euler', "a"), ('euler', "e"),
+                        ('target', "b")])
+        other["a"].node.TX.set(2.0)
+        other["e"].node.TY.set(3.0)
+
+        self.assertEqual(ts.diff(ts), [])
+
+        patch = ts.diff(other)
+
+        self.assertEqual(sorted((op['op'], op.get('name')) for op in patch),
+                         [('delete', "c"),
+                          ('insert', None),
+                          ('move', "d"),
+                          ('set', "a")])
+
+        b_node = ts["b"].node
+
+        ts.apply(patch)
+
+        self.assertEqual(ts.to_dict()['transforms'],
+                         other.to_dict()['transforms'])
+        self.assertIs(ts["b"].node, b_node)
+        self.assertEqual(ts.diff(other), [])
+
+        # Patches are serializable and apply to cached stacks.
+        cached_ts = gts.TransformStack(foo_node, cached=True)
+
+        cached_ts.apply(cached_ts.diff([{'type': 'euler', 'name': "e"}]))
+
+        self.assertEqual([t.node.name for t in cached_ts], ["e"])
+        self.assertEqual([t.node.name for t in ts], ["e"])
+
+        with self.assertRaises(ValueError):
+            ts.apply([{'op': 'move', 'name': "unknown", 'index': 0}])
+
+        with self.assertRaises(ValueError):
+            ts.apply([{'op': 'move', 'name': "e", 'index': 1}])
+
+        # Animation is part of the parameters.
+        data = ts["e"].to_dict()
+        data['keys'] = {'TX': [[1, 0.0], [2, 1.0]]}
+
+        self.assertEqual([op['op'] for op in ts.diff([data])], ['set'])
+
+        ts.apply(ts.diff([data]))
+
+        self.assertTrue(ts["e"].node.TX.isanimated())
+        self.assertEqual(ts.diff([data]), [])
+
+    def test_tracking(self):
+
+        import os
+
+        from guerilla_transform_stack import backend
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOTracking", "SceneGraphNode")
+            bar_node = mod.createnode("BARTracking", "SceneGraphNode")
+            constraint_node = mod.createnode("FOOTrackingConstraintNode",
+                                             "SceneGraphNode")
+
+        foo_ts = gts.TransformStack(foo_node)
+        bar_ts = gts.TransformStack(bar_node)
+
+        self.assertEqual(foo_ts.generation, 0)
+
+        t_euler, t_constraint = foo_ts.add_many([('euler', "my_euler"),
+                                                 ('constraint', None)])
+        bar_ts.add('euler')
+
+        gen = gts.current_generation()
+
+        self.assertEqual(gts.changed_since(gen), [])
+        self.assertEqual(t_euler.generation, foo_ts.generation)
+
+        t_constraint.add(constraint_node)
+
+        self.assertEqual(gts.changed_since(gen), ["FOOTracking"])
+        self.assertEqual(gts.changed_since(gen, [foo_node, bar_node]),
+                         [foo_node])
+        self.assertGreater(t_constraint.generation, t_euler.generation)
+
+        gen = gts.current_generation()
+
+        t_euler.move_top()
+        bar_ts.top.delete()
+
+        self.assertEqual(sorted(gts.changed_since(gen)),
+                         ["BARTracking", "FOOTracking"])
+        self.assertEqual(t_euler.generation, gts.current_generation() - 1)
+
+        # Unchanged stacks aren't reported, changes done outside of the
+        # package are caught by polling.
+        self.assertEqual(gts.poll_stacks([foo_node, bar_node]), [])
+
+        gen = gts.current_generation()
+
+        self.assertEqual(foo_ts.apply([]), [])
+        self.assertEqual(gts.poll_stacks([foo_node, bar_node]), [])
+
+        t_euler.node.movedown()
+
+        self.assertEqual(gts.poll_stacks([foo_node, bar_node]), [foo_node])
+        self.assertEqual(gts.changed_since(gen, [foo_node, bar_node]),
+                         [foo_node])
+
+        # Changes don't read node paths (only the fake backend counts them),
+        # and deleted transforms are not tracked anymore.
+        t_euler = foo_ts.add('euler')
+
+        if os.environ.get(backend.BACKEND_ENV_VAR) == 'fake':
+            guerilla.calls.clear()
+
+        t_euler_name = t_euler.node.name
+        t_euler.delete()
+
+        if os.environ.get(backend.BACKEND_ENV_VAR) == 'fake':
+            self.assertEqual(guerilla.calls['path'], 0)
+
+        self.assertEqual(
+            gts.tracking.transform_generation("FOOTracking", t_euler_name), 0)
+
+        # Stacks are tracked by path, whatever the node object.
+        self.assertEqual(
+            gts.TransformStack(guerilla.pynode("FOOTracking")).generation,
+            foo_ts.generation)
+
+        # Deleted nodes can be forgotten.
+        gts.forget_stacks(["FOOTracking"])
+
+        self.assertNotIn("FOOTracking", gts.changed_since(0))
+        self.assertIn("BARTracking", gts.changed_since(0))
+        self.assertEqual(
+            gts.tracking.transform_generation("FOOTracking", "my_euler"), 0)
+
+    def test_add_targets(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        if not _has_module('numpy'):
+            self.skipTest("NumPy is not available")
+
+        with guerilla.Modifier() as mod:
+            nodes = [mod.createnode("FOOAddTargets{}".format(i),
+                                    "SceneGraphNode")
+                     for i in range(3)]
+            ref_node = mod.createnode("FOOAddTargetsRef", "SceneGraphNode")
+
+        for node in (nodes[0], ref_node):
+            t_euler = gts.TransformStack(node).add('euler')
+            t_euler.node.TX.set(2.0)
+            t_euler.node.RY.set(90.0)
+
+        # Same target matrix than a target transform added one at a time.
+        expected = gts.TransformStack(ref_node).add('target')
+
+        targets = gts.add_targets(nodes, [(0.0, 0.0, 1.0),
+                                          (1.0, 0.0, 0.0),
+                                          (0.0, 2.0, 0.0)],
+                                  name="my_target")
+
+        self.assertEqual([gts.TransformStack(node).top for node in nodes],
+                         targets)
+
+        for value, expected_value in zip(
+                targets[0].target.getmatrix().asarray(),
+                expected.target.getmatrix().asarray()):
+            self.assertAlmostEqual(value, expected_value)
+
+        self.assertEqual(targets[1].target.getmatrix().asarray()[12:15],
+                         [1.0, 0.0, 0.0])
+        self.assertEqual(targets[2].target.getmatrix().asarray()[12:15],
+                         [0.0, 2.0, 0.0])
+
+        # Many target transforms can share the same target node.
+        shared = gts.add_targets(nodes, target=targets[0].target)
+
+        self.assertTrue(all(t.target is targets[0].target for t in shared))
+
+    def test_lazy_import(self):
+
+        import os
+        import subprocess
+        import sys
+
+        from guerilla_transform_stack import backend
+
+        # Needs a fresh Python process, so can't run inside Guerilla.
+        if os.environ.get(backend.BACKEND_ENV_VAR) != 'fake':
+            self.skipTest("Needs the fake Guerilla backend")
+
+        code = ("import sys\n"
+                "import guerilla_transform_stack as gts\n"
+                "print(sorted(m for m in sys.modules\n"
+                "             if m.startswith('guerilla')))\n"
+                "print(gts.TransformStack.__module__)\n"
+                "print('guerilla_transform_stack.fake_guerilla' in "
+                "sys.modules)\n"
+                "gts.backend.guerilla.Document()\n"
+                "print('guerilla_transform_stack.fake_guerilla' in "
+                "sys.modules)\n")
+
+        output = subprocess.check_output(
+            [sys.executable, '-c', code],
+            cwd=os.path.dirname(os.path.dirname(
+                os.path.abspath(backend.__file__))))
+
+        self.assertEqual(output.decode().split('\n'),
+                         ["['guerilla_transform_stack']",
+                          "guerilla_transform_stack.transform_stack",
+                          "False",
+                          "True",
+                          ""])
+
+    def test_registry(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        from guerilla_transform_stack import transform_stack
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOORegistry", "SceneGraphNode")
+
+        t_euler, t_shake = gts.TransformStack(foo_node).add_many(
+            [('euler', None), ('shake', None)])
+
+        type_name_to_class = dict(transform_stack.type_name_to_class)
+        guerilla_type_name_to_class = dict(
+            transform_stack.guerilla_type_name_to_class)
+
+        try:
+            # Shake transforms play an unregistered type.
+            del transform_stack.type_name_to_class['shake']
+            del transform_stack.guerilla_type_name_to_class['TransformShake']
+
+            with self.assertRaises(TypeError):
+                list(gts.TransformStack(foo_node))
+
+            with self.assertRaises(TypeError):
+                list(gts.iter_stacks([foo_node]))
+
+            ts = gts.TransformStack(foo_node, strict=False)
+
+            self.assertEqual([type(t) for t in ts],
+                             [transform_stack.TransformEuler,
+                              transform_stack.TransformUnknown])
+            self.assertEqual(ts.to_dict()['transforms'][1],
+                             {'type': 'unknown',
+                              'name': t_shake.node.name,
+                              'guerilla_type': 'TransformShake'})
+
+            # Cached stacks only read Guerilla type once per transform node.
+            ts = gts.TransformStack(foo_node, cached=True, strict=False)
+            list(ts)
+            with gts.profile() as report:
+                list(ts)
+            self.assertEqual(_guerilla_calls(report, 'getclassname'), 0)
+
+            (_, transforms), = gts.iter_stacks([foo_node], strict=False)
+
+            self.assertIsInstance(transforms[1],
+                                  transform_stack.TransformUnknown)
+
+            @gts.register_transform_class
+            class TransformStudioShake(transform_stack.TransformShake):
+                __slots__ = ()
+
+                @staticmethod
+                def type_name():
+                    return 'studio_shake'
+
+            ts = gts.TransformStack(foo_node)
+
+            self.assertIsInstance(ts[1], TransformStudioShake)
+            self.assertIsInstance(ts.add('studio_shake'),
+                                  TransformStudioShake)
+
+            with self.assertRaises(TypeError):
+                gts.register_transform_class(object)
+        finally:
+            transform_stack.type_name_to_class.clear()
+            transform_stack.type_name_to_class.update(type_name_to_class)
+            transform_stack.guerilla_type_name_to_class.clear()
+            transform_stack.guerilla_type_name_to_class.update(
+                guerilla_type_name_to_class)
+
+    def test_shake_params(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            nodes = [mod.createnode("FOOShakeParams{}".format(i),
+                                    "SceneGraphNode")
+                     for i in range(3)]
+
+        shakes = [t for t, in gts.bulk_add(nodes, [('shake', None)])]
+
+        self.assertEqual((shakes[0].amplitude, shakes[0].frequency,
+                          shakes[0].seed), (1.0, 1.0, 0))
+
+        shakes[0].amplitude = 2
+        shakes[0].seed = 3.0
+
+        self.assertEqual(shakes[0].amplitude, 2.0)
+        self.assertIsInstance(shakes[0].seed, int)
+
+        gts.set_shake_params(shakes, amplitude=0.5, seed=[1, 2, 3])
+
+        self.assertEqual([(t.amplitude, t.frequency, t.seed) for t in shakes],
+                         [(0.5, 1.0, 1), (0.5, 1.0, 2), (0.5, 1.0, 3)])
+
+        self.assertEqual(shakes[1].to_dict(),
+                         {'type': 'shake', 'name': shakes[1].node.name,
+                          'amplitude': 0.5, 'frequency': 1.0, 'seed': 2})
+
+        # Nothing is set if a list doesn't have one value per shake.
+        with self.assertRaises(ValueError):
+            gts.set_shake_params(shakes, amplitude=1.0, seed=[4, 5])
+
+        self.assertEqual([(t.amplitude, t.seed) for t in shakes],
+                         [(0.5, 1), (0.5, 2), (0.5, 3)])
+
+        try:
+            import numpy
+        except ImportError:
+            return
+
+        offsets = gts.preview_shakes(shakes, range(1, 25))
+
+        self.assertEqual(offsets.shape, (3, 24, 3))
+        self.assertTrue((numpy.abs(offsets) <= 0.5).all())
+
+        # Same seed gives the same shake, other seeds don't.
+        shakes[1].seed = 1
+
+        numpy.testing.assert_array_equal(
+            gts.preview_shakes(shakes[:2], range(1, 25)),
+            offsets[[0, 0]])
+        self.assertFalse(numpy.allclose(offsets[0], offsets[2]))
+
+    def test_srt(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            nodes = [mod.createnode("FOOSrt{}".format(i), "SceneGraphNode")
+                     for i in range(2)]
+
+        ts = gts.TransformStack(nodes[0])
+
+        t_euler1, _, t_euler2 = ts.add_many([('euler', None),
+                                             ('shake', None),
+                                             ('euler', None)])
+
+        identity = (1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        self.assertEqual(t_euler1.get_srt(), identity)
+
+        with gts.profile() as report:
+            t_euler1.set_srt((1, 1, 1, 0, 0, 45, 2, 0, 0))
+
+        # Only changed plugs are set.
+        self.assertEqual(_guerilla_calls(report, 'Plug.set'), 2)
+        self.assertEqual(t_euler1.get_srt(),
+                         (1.0, 1.0, 1.0, 0.0, 0.0, 45.0, 2.0, 0.0, 0.0))
+
+        self.assertEqual(ts.get_srt(), [t_euler1.get_srt(), identity])
+
+        with self.assertRaises(ValueError):
+            ts.set_srt([identity])
+
+        ts.set_srt([identity, t_euler1.get_srt()])
+
+        self.assertEqual(t_euler2.get_srt(),
+                         (1.0, 1.0, 1.0, 0.0, 0.0, 45.0, 2.0, 0.0, 0.0))
+
+        eulers = [t_euler1, gts.TransformStack(nodes[1]).add('euler')]
+
+        try:
+            import numpy
+        except ImportError:
+            gts.set_srt_many(eulers, [identity, t_euler2.get_srt()])
+            self.assertEqual(gts.get_srt_many(eulers),
+                             [identity, t_euler2.get_srt()])
+            return
+
+        srt = gts.get_srt_many(eulers, array=True)
+
+        self.assertEqual(srt.shape, (2, 9))
+
+        srt[:, 6] += 1.0
+
+        with gts.profile() as report:
+            gts.set_srt_many(eulers, srt)
+
+        self.assertEqual(_guerilla_calls(report, 'Plug.set'), 2)
+        numpy.testing.assert_array_equal(
+            gts.get_srt_many(eulers, array=True), srt)
+
+    def test_edit(self):
+
+        import os
+
+        from guerilla_transform_stack import backend
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        # Only the fake backend counts node creations.
+        fake = os.environ.get(backend.BACKEND_ENV_VAR) == 'fake'
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOEdit", "SceneGraphNode")
+            driver_node = mod.createnode("FOOEditDriver", "SceneGraphNode")
+            tmp_node = mod.createnode("FOOEditTmp", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node, cached=True)
+
+        t_euler, t_constraint, t_shake = ts.add_many([('euler', "a"),
+                                                      ('constraint', "b"),
+                                                      ('shake', "c")])
+        t_constraint.add(driver_node)
+
+        if fake:
+            guerilla.calls.clear()
+
+        with ts.edit() as tx:
+
+            name = tx.add('euler')
+            tx.set_srt(name, (1, 1, 1, 0, 0, 0, 5, 0, 0))
+            tx.move_bottom(name)
+
+            # Coalesced operations.
+            tx.delete(tx.add('shake'))
+            tx.move_top(t_euler)
+            tx.move_down(t_euler)
+            tx.move_bottom(t_euler)
+
+            tx.delete(t_shake)
+            tx.set_params(t_constraint, weights=[0.5])
+
+            self.assertEqual(tx.names, ["a", "Euler", "b"])
+
+            # Nothing is applied before commit.
+            self.assertEqual(len(ts), 3)
+
+        if fake:
+            self.assertEqual(guerilla.calls['createnode'], 1)
+
+        self.assertEqual([t.node.name for t in ts], ["a", "Euler", "b"])
+        self.assertIs(ts["a"].node, t_euler.node)
+        self.assertEqual(ts["Euler"].get_srt()[6], 5.0)
+        self.assertEqual(ts["b"].weights, [0.5])
+
+        # A transform deleted then added again is a new one.
+        ts.add('shake', "c").set_params(amplitude=5.0, seed=7)
+        ts["a"].set_srt((2, 2, 2, 10, 20, 30, 1, 2, 3))
+
+        old_nodes = [ts["a"].node, ts["c"].node]
+
+        with ts.edit() as tx:
+            tx.delete("a")
+            tx.delete("c")
+            tx.add('euler', "a")
+            tx.add('shake', "c")
+
+        self.assertEqual([t.node.name for t in ts], ["Euler", "b", "a", "c"])
+        self.assertIsNot(ts["a"].node, old_nodes[0])
+        self.assertIsNot(ts["c"].node, old_nodes[1])
+        self.assertEqual(ts["a"].get_srt(),
+                         (1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0))
+        self.assertEqual(ts["c"].to_dict(),
+                         gts.TransformStack(tmp_node).add('shake',
+                                                          "c").to_dict())
+
+        with ts.edit() as tx:
+            tx.delete("c")
+            tx.move_bottom("a")
+
+        # Failure in the block applies nothing.
+        with self.assertRaises(ZeroDivisionError):
+            with ts.edit() as tx:
+                tx.delete("a")
+                1 / 0
+
+        self.assertEqual([t.node.name for t in ts], ["a", "Euler", "b"])
+
+        with self.assertRaises(KeyError):
+            with ts.edit() as tx:
+                tx.delete("unknown")
+
+        # Invalid parameters are rejected before anything is modified.
+        ts["a"].node.TX.setkey(1, 0.0)
+        ts["a"].node.TX.setkey(2, 1.0)
+
+        a_node = ts["a"].node
+
+        with self.assertRaises(ValueError):
+            with ts.edit() as tx:
+                tx.delete("a")
+                tx.set_params("Euler", srt=['x'] * 9)
+
+        self.assertIs(ts["a"].node, a_node)
+        self.assertTrue(a_node.TX.isanimated())
+
+        with self.assertRaises(ValueError):
+            with ts.edit() as tx:
+                tx.add('shake', amplitude="loud")
+
+        self.assertEqual(len(ts), 3)
+
+        # Missing constraining nodes are rejected too.
+        with self.assertRaises(KeyError):
+            with ts.edit() as tx:
+                tx.add('shake', "d")
+                tx.move_bottom("b")
+                tx.constrain("b", [tmp_node])
+                tmp_node.delete()
+
+        self.assertEqual([(t['type'], t['name']) for t in ts.to_dict()[
+                             'transforms']],
+                         [('euler', "a"), ('euler', "Euler"),
+                          ('constraint', "b")])
+        self.assertEqual(ts["b"].objects, [driver_node])
+        self.assertEqual(ts["b"].weights, [0.5])
+
+    def test_class_cache(self):
+
+        from guerilla_transform_stack.backend import guerilla
+        import guerilla_transform_stack as gts
+
+        with guerilla.Modifier() as mod:
+            foo_node = mod.createnode("FOOClassCache", "SceneGraphNode")
+
+        ts = gts.TransformStack(foo_node)
+
+        t_euler = ts.add('euler', "X")
+        t_euler.node.delete()
+
+        # Transform node replaced outside of the transform stack.
+        with guerilla.Modifier() as mod:
+            mod.connect(foo_node.Transform,
+                        mod.createnode("X", "TransformShake", foo_node).Out)
+
+        self.assertEqual([type(t) for t in ts],
+                         [gts.transform_stack.TransformShake])
+
 
 def test():
     suite = unittest.TestSuite()
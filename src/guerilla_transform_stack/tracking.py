@@ -0,0 +1,184 @@
+"""
+This module contains change tracking of transform stacks.
+
+Every modification done through the package bumps a global generation
+counter and records it on the modified transform stack (and transforms), so
+tools can only process what changed since they last looked:
+
+    >>> gen = gts.current_generation()
+    >>> ...  # Modifications.
+    >>> for path in gts.changed_since(gen):
+    ...     refresh(path)
+
+Modifications done outside of the package (directly using Guerilla API) are
+only caught by polling transform stacks connections with `poll_stacks()`.
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+# Generation of the last change.
+_generation = 0
+
+# Parent node path to generation of the last change of its transform stack.
+_stack_generations = {}
+
+# Transform node path to generation of its last change.
+_transform_generations = {}
+
+# Parent node path to transform node names, from bottom to top, when the
+# transform stack was last polled.
+_signatures = {}
+
+
+def current_generation():
+    """Return generation of the last change done through the package.
+
+    Returns:
+        int:
+    """
+    return _generation
+
+
+def _transform_path(path, name):
+    """Return path of a transform node.
+
+    Args:
+        path (str): Parent scene graph node path.
+        name (str): Transform node name.
+
+    Returns:
+        str:
+    """
+    return '{}|{}'.format(path, name)
+
+
+def mark_changed(path, transform_names=(), deleted_names=()):
+    """Record a change of the transform stack of given node.
+
+    Nodes are recorded by path, which callers read once per transform stack.
+
+    Args:
+        path (str): Parent scene graph node path.
+        transform_names (iterable[str], optional): Names of changed transform
+          nodes.
+        deleted_names (iterable[str], optional): Names of deleted transform
+          nodes, which are not tracked anymore.
+
+    Returns:
+        int: Generation of the change.
+    """
+    global _generation
+
+    _generation += 1
+
+    _stack_generations[path] = _generation
+
+    for name in transform_names:
+        _transform_generations[_transform_path(path, name)] = _generation
+
+    for name in deleted_names:
+        _transform_generations.pop(_transform_path(path, name), None)
+
+    return _generation
+
+
+def stack_generation(path):
+    """Return generation of the last change of given node transform stack.
+
+    Args:
+        path (str): Parent scene graph node path.
+
+    Returns:
+        int: 0 if the transform stack never changed.
+    """
+    return _stack_generations.get(path, 0)
+
+
+def transform_generation(path, name):
+    """Return generation of the last change of given transform node.
+
+    Args:
+        path (str): Parent scene graph node path.
+        name (str): Transform node name.
+
+    Returns:
+        int: 0 if the transform never changed.
+    """
+    return _transform_generations.get(_transform_path(path, name), 0)
+
+
+def forget_stacks(paths):
+    """Stop tracking transform stacks of given nodes, when they are deleted.
+
+    Args:
+        paths (iterable[str]): Parent scene graph node paths.
+    """
+    for path in paths:
+
+        _stack_generations.pop(path, None)
+        _signatures.pop(path, None)
+
+        prefix = _transform_path(path, '')
+
+        for transform_path in [p for p in _transform_generations
+                               if p.startswith(prefix)]:
+            del _transform_generations[transform_path]
+
+
+def changed_since(generation, nodes=None):
+    """Return transform stacks changed after given generation.
+
+    Args:
+        generation (int): Generation, as returned by `current_generation()`.
+        nodes (iterable[guerilla.SceneGraphNode], optional): Parent scene
+          graph nodes to check.
+
+    Returns:
+        list[str]|list[guerilla.SceneGraphNode]: Given nodes which transform
+          stack changed, or path of every changed parent node if `nodes`
+          isn't provided.
+    """
+    if nodes is None:
+        return [path for path, gen in _stack_generations.items()
+                if gen > generation]
+
+    return [node for node in nodes
+            if stack_generation(node.path) > generation]
+
+
+def poll_stacks(nodes):
+    """Record changes of transform stacks modified outside of the package.
+
+    Transform stacks connections are compared with the ones found on the
+    previous poll, so changes done through the package since then are
+    reported too. The first poll of a transform stack only records them.
+    Parameter changes are not detected.
+
+    Args:
+        nodes (iterable[guerilla.SceneGraphNode]): Parent scene graph nodes
+          to poll.
+
+    Returns:
+        list[guerilla.SceneGraphNode]: Nodes which transform stack changed.
+    """
+    from .transform import iter_transforms
+
+    changed = []
+
+    for node in nodes:
+
+        path = node.path
+
+        signature = tuple(n.name for n in iter_transforms(node))
+
+        old_signature = _signatures.get(path)
+
+        if old_signature is not None and old_signature != signature:
+            mark_changed(path)
+            changed.append(node)
+
+        _signatures[path] = signature
+
+    return changed
@@ -0,0 +1,297 @@
+"""
+This module contains transactions editing a transform stack in a single
+Guerilla modifier.
+
+A transaction edits a description of the transform stack (see
+`TransformStack.to_dict()`). On commit, the description is compared with the
+transform stack and only the resulting patch is applied (see
+`TransformStack.diff()`), so redundant operations (a transform added then
+deleted, repeated moves) cost nothing:
+
+    >>> with ts.edit() as tx:
+    ...     name = tx.add('euler')
+    ...     tx.set_srt(name, (1, 1, 1, 0, 45, 0, 0, 0, 0))
+    ...     tx.move_bottom(name)
+"""
+from __future__ import (absolute_import,
+                        division,
+                        print_function,
+                        unicode_literals)
+
+from .transform import Transform, TransformConstraint, TransformEuler
+from .transform_stack import type_name_to_class
+
+
+class StackTransaction(object):
+    """Queued modifications of a transform stack, committed at once.
+
+    Transforms are designated by their name, or by transform objects of the
+    stack.
+    """
+
+    def __init__(self, stack):
+        """
+
+        Args:
+            stack (TransformStack): Transform stack to edit.
+        """
+        self.stack = stack
+        self.committed = False
+        self._before = stack.to_dict()['transforms']
+        self._descriptions = [dict(data) for data in self._before]
+
+        # Names of deleted transforms of the stack, and descriptions of
+        # queued additions, so an addition is never matched to a deleted
+        # transform with the same type and name.
+        self._deleted = set()
+        self._added = []
+
+    def __len__(self):
+        return len(self._descriptions)
+
+    @property
+    def names(self):
+        """Return transform names the stack will have once the transaction
+        is committed.
+
+        Returns:
+            list[str]: Transform names, from bottom to top.
+        """
+        return [data['name'] for data in self._descriptions]
+
+    def _index(self, item):
+        """Return position of given transform.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+
+        Returns:
+            int:
+
+        Raises:
+            KeyError: If there is no transform with given name.
+        """
+        name = item.node.name if isinstance(item, Transform) else item
+
+        for i, data in enumerate(self._descriptions):
+            if data['name'] == name:
+                return i
+
+        raise KeyError(name)
+
+    def _description(self, item, cls=None):
+        """Return description of given transform.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+            cls (type, optional): Expected transform class.
+
+        Returns:
+            dict:
+
+        Raises:
+            TypeError: If transform isn't of `cls` type.
+        """
+        data = self._descriptions[self._index(item)]
+
+        if cls is not None and data['type'] != cls.type_name():
+            raise TypeError("'{}' is not a {} transform"
+                            .format(data['name'], cls.type_name()))
+
+        return data
+
+    def _unique_name(self, name):
+        """Return given name, suffixed if a transform already has it.
+
+        Args:
+            name (str):
+
+        Returns:
+            str:
+        """
+        names = set(self.names)
+
+        if name not in names:
+            return name
+
+        i = 1
+
+        while '{}{}'.format(name, i) in names:
+            i += 1
+
+        return '{}{}'.format(name, i)
+
+    def add(self, type_, name=None, **params):
+        """Queue the addition of a transform on top of the stack.
+
+        Args:
+            type_ (str): Transform type ('euler', 'target', 'baked',
+              'contraint', 'shake').
+            name (str, optional): Guerilla transform node name.
+            **params: Type specific parameters (see `Transform.to_dict()`).
+
+        Returns:
+            str: Name of the transform to add, to designate it in other
+              operations.
+
+        Raises:
+            ValueError: If transform type is invalid.
+        """
+        try:
+            cls = type_name_to_class[type_]
+        except KeyError:
+            raise ValueError("invalid transform type argument")
+
+        data = dict(params)
+        data['type'] = type_
+        data['name'] = self._unique_name(name or cls._default_name())
+
+        self._descriptions.append(data)
+        self._added.append(data)
+
+        return data['name']
+
+    def delete(self, item):
+        """Queue the deletion of a transform.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+        """
+        data = self._descriptions.pop(self._index(item))
+
+        if not any(data is added for added in self._added):
+            self._deleted.add(data['name'])
+
+    def move_to(self, item, index):
+        """Queue the move of a transform at given position.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+            index (int): New position from the bottom of the stack, negative
+              values count from the top.
+
+        Raises:
+            IndexError: If position is out of range.
+        """
+        if index < 0:
+            index += len(self._descriptions)
+
+        if not 0 <= index < len(self._descriptions):
+            raise IndexError("transform stack index out of range")
+
+        self._descriptions.insert(
+            index, self._descriptions.pop(self._index(item)))
+
+    def move_up(self, item):
+        """Queue the move of a transform one position up.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+        """
+        self.move_to(item, min(self._index(item) + 1,
+                               len(self._descriptions) - 1))
+
+    def move_down(self, item):
+        """Queue the move of a transform one position down.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+        """
+        self.move_to(item, max(self._index(item) - 1, 0))
+
+    def move_top(self, item):
+        """Queue the move of a transform on top.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+        """
+        self.move_to(item, -1)
+
+    def move_bottom(self, item):
+        """Queue the move of a transform on bottom.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+        """
+        self.move_to(item, 0)
+
+    def set_params(self, item, **params):
+        """Queue the change of type specific parameters of a transform.
+
+        Args:
+            item (str|Transform): Transform, or transform name.
+            **params: Type specific parameters (see `Transform.to_dict()`).
+        """
+        self._description(item).update(params)
+
+    def set_srt(self, item, srt):
+        """Queue the change of scale, rotation and translation values of an
+        euler transform, removing its animation.
+
+        Args:
+            item (str|Transform): Euler transform, or transform name.
+            srt (iterable[float]): SX, SY, SZ, RX, RY, RZ, TX, TY, TZ
+              values, rotations in degrees.
+        """
+        data = self._description(item, TransformEuler)
+        data['srt'] = [float(v) for v in srt]
+
+        # Values replace animation.
+        data.pop('keys', None)
+
+    def constrain(self, item, nodes, weights=None):
+        """Queue the addition of constraining nodes to a constraint
+        transform.
+
+        Args:
+            item (str|Transform): Constraint transform, or transform name.
+            nodes (list[guerilla.SceneGraphNode]): Nodes to add as
+              constraint.
+            weights (float|list[float], optional): Weight of every node, or
+              of each node. Default to 1.
+        """
+        data = self._description(item, TransformConstraint)
+
+        if weights is None or isinstance(weights, (int, float)):
+            weights = [1.0 if weights is None else weights] * len(nodes)
+
+        data['objects'] = (list(data.get('objects', ())) +
+                           [node.path for node in nodes])
+        data['weights'] = list(data.get('weights', ())) + list(weights)
+
+    def commit(self):
+        """Apply queued modifications in a single Guerilla modifier.
+
+        Operations and parameters are checked before the transform stack is
+        modified (see `TransformStack.apply()`), so invalid ones change
+        nothing. If Guerilla still fails while applying them, the transform
+        stack is restored from its description before the transaction
+        (deleted transforms are created again from their `to_dict()`
+        description, losing their connections) and the error is raised
+        again.
+
+        Returns:
+            list[Transform]: Added transforms.
+
+        Raises:
+            RuntimeError: If the transaction is already committed.
+            ValueError: If an operation or a parameter is invalid.
+        """
+        if self.committed:
+            raise RuntimeError("transaction already committed")
+
+        self.committed = True
+
+        ts = self.stack
+
+        replaced = {data['name'] for data in self._added
+                    if data['name'] in self._deleted}
+
+        patch = ts.diff(self._descriptions, replace=replaced)
+
+        try:
+            return ts.apply(patch)
+        except Exception:
+            ts.invalidate()
+            ts.apply(ts.diff(self._before))
+            raise
@@ -1,9 +1,23 @@
 """
 This module contains transform types.
 """
+import collections
 import math
 
-import guerilla
+from .backend import guerilla
+from .tracking import mark_changed, transform_generation
+
+# Guerilla plug names of scale, rotation and translation parameters.
+SRT_PLUG_NAMES = ('SX', 'SY', 'SZ',
+                  'RX', 'RY', 'RZ',
+                  'TX', 'TY', 'TZ')
+
+# Position of a transform in its stack.
+Position = collections.namedtuple('Position', ('index',
+                                               'depth',
+                                               'is_on_top',
+                                               'is_on_bottom',
+                                               'is_on_middle'))
 
 
 def get_top_transform_plug(node):
@@ -31,30 +45,127 @@ def get_top_transform_plug(node):
     return cur_plug
 
 
+def iter_transforms(node):
+    """Iterate over Guerilla transform nodes of given `node`, from bottom to
+    top.
+
+    Args:
+        node (guerilla.SceneGraphNode): Parent scene graph node.
+
+    Yields:
+        guerilla.Transform:
+    """
+    cur_plug = node.Transform
+
+    while True:
+
+        in_plug = cur_plug.getinput()
+
+        if in_plug:
+            node = in_plug.parent
+            yield node
+        else:
+            return
+
+        cur_plug = node.In
+
+
+def relink_transforms(node, mod, old_nodes, new_nodes):
+    """Connect transform nodes of given `node` in a new order.
+
+    Only connections which change are done, so reordering is O(n) and
+    untouched transforms keep their connections.
+
+    Args:
+        node (guerilla.SceneGraphNode): Parent scene graph node.
+        mod (guerilla.Modifier):
+        old_nodes (list[guerilla.Transform]): Current transform nodes, from
+          bottom to top.
+        new_nodes (list[guerilla.Transform]): Same transform nodes in their
+          new order, from bottom to top.
+    """
+    old_nodes = list(old_nodes)
+
+    # Transform node below each transform node, None for the bottom one.
+    old_below = dict(zip(old_nodes[1:], old_nodes[:-1]))
+
+    prev_node = None
+
+    for i, cur_node in enumerate(new_nodes):
+
+        if i == 0 and old_nodes and old_nodes[0] is cur_node:
+            pass
+        elif i and old_below.get(cur_node) is prev_node:
+            pass
+        else:
+            below_plug = prev_node.In if prev_node else node.Transform
+            mod.connect(below_plug, cur_node.Out)
+
+        prev_node = cur_node
+
+    # New top transform node must not have input anymore.
+    if new_nodes and new_nodes[-1] is not old_nodes[-1]:
+        above_node = old_nodes[old_nodes.index(new_nodes[-1]) + 1]
+        mod.disconnect(new_nodes[-1].In, above_node.Out)
+
+
+def decompose_matrix(mtx):
+    """Return scale, rotation and translation values of given matrix.
+
+    Args:
+        mtx (guerilla.matrix):
+
+    Returns:
+        tuple[float]: SX, SY, SZ, RX, RY, RZ, TX, TY, TZ values, rotations
+          in degrees.
+    """
+    (sx, sy, sz,
+     rx, ry, rz,
+     tx, ty, tz) = mtx.decompose()
+
+    return (sx, sy, sz,
+            (rx*180.0)/math.pi, (ry*180.0)/math.pi, (rz*180.0)/math.pi,
+            tx, ty, tz)
+
+
 class Transform(object):
     """Base class representing a Guerilla transform node.
 
     Should not be instantiated.
     """
-    def __init__(self, node=None):
+    __slots__ = ('node', '_stack', '_hash', '__weakref__')
+
+    def __init__(self, node=None, stack=None):
         """
 
         Args:
             node (guerilla.Transform): Transform Guerilla node to wrap.
+            stack (TransformStack, optional): Transform stack the transform
+              comes from, notified when the transform is modified.
         """
         self.node = node
+        self._stack = stack
+        self._hash = None
 
     def __repr__(self):
         return "{}('{}')".format(self.__class__.__name__, self.node.path)
 
     def __eq__(self, other):
         if isinstance(other, Transform):
-            return self.node.path == other.node.path
+            return (self.node is other.node or
+                    self.node.path == other.node.path)
         else:
             return False
 
     def __ne__(self, other):
-        return self.node.path != other.node.path
+        return not self == other
+
+    def __hash__(self):
+        # Node path is only read once per wrapper.
+        if self._hash is None:
+            self._hash = hash(self.node.path)
+
+        return self._hash
 
     @staticmethod
     def _default_name():
@@ -86,13 +197,15 @@ class Transform(object):
         raise NotImplementedError
 
     @classmethod
-    def create(cls, node, mod, name=None):
+    def create(cls, node, mod, name=None, top_plug=None):
         """Create default typed transform on given Guerilla `node`.
 
         Args:
             node (guerilla.SceneGraphNode): Parent scene graph node.
             mod (guerilla.Modifier):
             name (str, optional): Transform node name.
+            top_plug (guerilla.Plug, optional): Input plug of the top
+              transform node, found by walking the stack if not provided.
 
         Returns:
             Transform: The created transform object.
@@ -102,33 +215,170 @@ class Transform(object):
 
         transform_node = mod.createnode(name, cls.guerilla_type_name(), node)
 
-        top_plug = get_top_transform_plug(node)
+        if top_plug is None:
+            top_plug = get_top_transform_plug(node)
 
         mod.connect(top_plug, transform_node.Out)
 
         return cls(transform_node)
 
+    def _stack_changed(self):
+        """Notify transform stack the transform comes from it has changed.
+        """
+        if self._stack is not None:
+            self._stack.invalidate()
+
+    def _parent_path(self):
+        """Return path of the parent scene graph node, read once per
+        transform stack if the transform comes from one.
+
+        Returns:
+            str:
+        """
+        if self._stack is not None:
+            return self._stack._node_path()
+
+        return self.node.parent.path
+
+    def _changed(self):
+        """Record a change of the transform, and of its transform stack.
+        """
+        mark_changed(self._parent_path(), [self.node.name])
+
+    @property
+    def generation(self):
+        """Return generation of the last change of the transform done
+        through the package.
+
+        Returns:
+            int: 0 if the transform never changed.
+        """
+        return transform_generation(self._parent_path(), self.node.name)
+
+    def _stack_nodes(self):
+        """Return transform nodes of the stack the transform is part of.
+
+        Returns:
+            list[guerilla.Transform]: Transform nodes, from bottom to top.
+        """
+        if self._stack is not None:
+            return list(self._stack._nodes())
+
+        return list(iter_transforms(self.node.parent))
+
+    def move_to(self, index):
+        """Move Guerilla transform at given position in a single modifier.
+
+        Transform connections are directly rewired, without moving the
+        transform one position at a time.
+
+        Args:
+            index (int): New position from the bottom of the stack, negative
+              values count from the top.
+
+        Raises:
+            IndexError: If position is out of range.
+        """
+        nodes = self._stack_nodes()
+
+        name = self.node.name
+
+        cur_index = next(i for i, n in enumerate(nodes) if n.name == name)
+
+        if index < 0:
+            index += len(nodes)
+
+        if not 0 <= index < len(nodes):
+            raise IndexError("transform stack index out of range")
+
+        if index == cur_index:
+            return
+
+        new_nodes = list(nodes)
+        new_nodes.insert(index, new_nodes.pop(cur_index))
+
+        with guerilla.Modifier() as mod:
+            relink_transforms(self.node.parent, mod, nodes, new_nodes)
+
+        self._changed()
+
+        if self._stack is not None:
+            self._stack._reordered(new_nodes)
+
     def move_up(self):
         """Move Guerilla transform up.
         """
         self.node.moveup()
+        self._changed()
+        self._stack_changed()
 
     def move_down(self):
         """Move Guerilla transform down.
         """
         self.node.movedown()
+        self._changed()
+        self._stack_changed()
 
     def move_top(self):
         """Move Guerilla transform on top.
         """
-        while not self.is_on_top:
-            self.node.movetop()
+        self.move_to(-1)
 
     def move_bottom(self):
         """Move Guerilla transform on bottom.
         """
-        while not self.is_on_bottom:
-            self.node.movedown()
+        self.move_to(0)
+
+    @property
+    def position(self):
+        """Return position of the transform in its stack.
+
+        Position is read from the snapshot of the transform stack the
+        transform comes from if it's cached, else the stack is walked once.
+
+        Returns:
+            Position: Index from the bottom of the stack, transform count of
+              the stack, and if the transform is on top, bottom or middle.
+
+        Raises:
+            ValueError: If transform is not in its stack anymore.
+        """
+        name = self.node.name
+
+        if self._is_cached():
+
+            depth = len(self._stack)
+
+            try:
+                index = self._stack._name_index()[name]
+            except KeyError:
+                index = None
+
+        else:
+
+            index = None
+            depth = 0
+
+            for depth, node in enumerate(iter_transforms(self.node.parent),
+                                         1):
+                if index is None and node.name == name:
+                    index = depth - 1
+
+        if index is None:
+            raise ValueError("transform is not in its stack anymore")
+
+        return Position(index, depth,
+                        index == depth - 1,
+                        index == 0,
+                        0 < index < depth - 1)
+
+    def _is_cached(self):
+        """Return if the transform comes from a cached transform stack.
+
+        Returns:
+            bool:
+        """
+        return self._stack is not None and self._stack.cached
 
     @property
     def is_alone(self):
@@ -137,7 +387,10 @@ class Transform(object):
         Returns:
             bool: True if transform is alone.
         """
-        return self.is_on_top and self.is_on_bottom
+        if self._is_cached():
+            return self.position.depth == 1
+
+        return self.node.In.getinput() is None and self.is_on_bottom
 
     @property
     def is_on_top(self):
@@ -146,7 +399,10 @@ class Transform(object):
         Returns:
             bool: True if transform is on top.
         """
-        return self.node.In.get() is None
+        if self._is_cached():
+            return self.position.is_on_top
+
+        return self.node.In.getinput() is None
 
     @property
     def is_on_bottom(self):
@@ -155,6 +411,9 @@ class Transform(object):
         Returns:
             bool: True if transform is on bottom.
         """
+        if self._is_cached():
+            return self.position.is_on_bottom
+
         return any(out_plug.name == 'Transform'
                    for out_plug in self.node.Out.getoutputs())
 
@@ -165,6 +424,9 @@ class Transform(object):
         Returns:
             bool: True if transform is between top and bottom transform.
         """
+        if self._is_cached():
+            return self.position.is_on_middle
+
         return (self.node.In.getinput() is not None and
                 all(out_plug.name != 'Transform'
                     for out_plug in self.node.Out.getoutputs()))
@@ -174,12 +436,57 @@ class Transform(object):
 
         After calling `delete()`, `node` property is set to `None`.
         """
+        mark_changed(self._parent_path(), deleted_names=[self.node.name])
         self.node.delete()
+        self._stack_changed()
+
+    def to_dict(self):
+        """Return serializable description of the transform.
+
+        Returns:
+            dict: Transform type, name and type specific parameters.
+        """
+        data = {'type': self.type_name(),
+                'name': self.node.name}
+
+        data.update(self._get_params())
+
+        return data
+
+    def _get_params(self):
+        """Return type specific parameters of the transform.
+
+        Returns:
+            dict:
+        """
+        return {}
+
+    def _set_params(self, params):
+        """Set type specific parameters of the transform.
+
+        Args:
+            params (dict): Parameters, as returned by `_get_params()`.
+        """
+        pass
+
+    @classmethod
+    def _check_params(cls, params):
+        """Check type specific parameters can be set, without modifying
+        anything.
+
+        Args:
+            params (dict): Parameters, as returned by `_get_params()`.
+
+        Raises:
+            ValueError: If a parameter is invalid.
+        """
+        pass
 
 
 class TransformEuler(Transform):
     """class representing a Guerilla euler transform node.
     """
+    __slots__ = ()
 
     @staticmethod
     def _default_name():
@@ -194,13 +501,15 @@ class TransformEuler(Transform):
         return 'TransformEuler'
 
     @classmethod
-    def create(cls, node, mod, name=None):
+    def create(cls, node, mod, name=None, top_plug=None):
         """Create default euler transform on given Guerilla `node`.
 
         Args:
             node (guerilla.SceneGraphNode): Parent scene graph node.
             mod (guerilla.Modifier):
             name (str, optional): Transform node name.
+            top_plug (guerilla.Plug, optional): Input plug of the top
+              transform node, found by walking the stack if not provided.
 
         Returns:
             Transform: The created euler transform object.
@@ -210,35 +519,244 @@ class TransformEuler(Transform):
 
         transform_node = mod.createnode(name, cls.guerilla_type_name(), node)
 
+        # Get transform node on the top of the stack
+        if top_plug is None:
+            top_plug = get_top_transform_plug(node)
+
         # If node has no transform, create transform from current
         # transformation.
-        if node.Transform.getinput() is None:
-
-            (sx, sy, sz,
-             rx, ry, rz,
-             tx, ty, tz) = node.getmatrix().decompose()
-
-            transform_node.SX.set(sx)
-            transform_node.SY.set(sy)
-            transform_node.SZ.set(sz)
-            transform_node.RX.set((rx*180.0)/math.pi)
-            transform_node.RY.set((ry*180.0)/math.pi)
-            transform_node.RZ.set((rz*180.0)/math.pi)
-            transform_node.TX.set(tx)
-            transform_node.TY.set(ty)
-            transform_node.TZ.set(tz)
-
-        # Get transform node on the top of the stack
-        top_plug = get_top_transform_plug(node)
+        if top_plug.name == 'Transform':
+            _write_srt(transform_node, decompose_matrix(node.getmatrix()))
 
         mod.connect(top_plug, transform_node.Out)
 
         return cls(transform_node)
 
+    def get_srt(self):
+        """Return scale, rotation and translation values.
+
+        Returns:
+            tuple[float]: SX, SY, SZ, RX, RY, RZ, TX, TY, TZ values,
+              rotations in degrees.
+        """
+        return _read_srt(self.node)
+
+    def set_srt(self, srt):
+        """Set scale, rotation and translation values in a single Guerilla
+        modifier.
+
+        Only plugs which value changes are set.
+
+        Args:
+            srt (iterable[float]): SX, SY, SZ, RX, RY, RZ, TX, TY, TZ
+              values, rotations in degrees.
+        """
+        set_srt_many([self], [srt])
+
+    def _get_params(self):
+        return _get_srt_params(self.node)
+
+    def _set_params(self, params):
+        _set_srt_params(self.node, params)
+
+    @classmethod
+    def _check_params(cls, params):
+        _check_srt_params(params)
+
+
+def _get_srt_params(node):
+    """Return scale, rotation and translation parameters of given Guerilla
+    transform node.
+
+    Args:
+        node (guerilla.Transform): Guerilla euler or baked transform node.
+
+    Returns:
+        dict: Current 'srt' values, and 'keys' of animated plugs, if any,
+          as [frame, value] pairs per plug name.
+    """
+    params = {'srt': list(_read_srt(node))}
+
+    keys = {}
+
+    for plug_name in SRT_PLUG_NAMES:
+
+        plug = getattr(node, plug_name)
+
+        if plug.isanimated():
+            keys[plug_name] = [[frame, value]
+                               for frame, value in plug.getkeys()]
+
+    if keys:
+        params['keys'] = keys
+
+    return params
+
+
+def _set_srt_params(node, params):
+    """Set scale, rotation and translation parameters of given Guerilla
+    transform node.
+
+    Args:
+        node (guerilla.Transform): Guerilla euler or baked transform node.
+        params (dict): Parameters, as returned by `_get_srt_params()`.
+    """
+    # Setting values drops previous keys.
+    if 'srt' in params:
+        _write_srt(node, params['srt'])
+
+    for plug_name, keys in params.get('keys', {}).items():
+
+        plug = getattr(node, plug_name)
+
+        for frame, value in keys:
+            plug.setkey(frame, value)
+
+
+def _check_srt_params(params):
+    """Check scale, rotation and translation parameters can be set.
+
+    Args:
+        params (dict): Parameters, as returned by `_get_srt_params()`.
+
+    Raises:
+        ValueError: If a parameter is invalid.
+    """
+    if 'srt' in params:
+        _float_values(params['srt'], 'srt', len(SRT_PLUG_NAMES))
+
+    for plug_name, keys in params.get('keys', {}).items():
+
+        if plug_name not in SRT_PLUG_NAMES:
+            raise ValueError("invalid plug name '{}'".format(plug_name))
+
+        for key in keys:
+            _float_values(key, 'key', 2)
+
+
+def _float_values(values, name, count):
+    """Check given values are `count` numbers.
+
+    Args:
+        values (iterable): Values to check.
+        name (str): Parameter name, for error message.
+        count (int): Expected value count.
+
+    Raises:
+        ValueError: If values aren't `count` numbers.
+    """
+    try:
+        values = [float(v) for v in values]
+    except (TypeError, ValueError):
+        raise ValueError("invalid {} values {!r}".format(name, values))
+
+    if len(values) != count:
+        raise ValueError("expected {} {} values, got {}"
+                         .format(count, name, len(values)))
+
+
+def _read_srt(node):
+    """Return scale, rotation and translation values of given Guerilla
+    transform node.
+
+    Args:
+        node (guerilla.Transform): Guerilla euler or baked transform node.
+
+    Returns:
+        tuple[float]: SX, SY, SZ, RX, RY, RZ, TX, TY, TZ values.
+    """
+    return tuple(getattr(node, plug_name).get()
+                 for plug_name in SRT_PLUG_NAMES)
+
+
+def _write_srt(node, srt, current=None):
+    """Set scale, rotation and translation values of given Guerilla
+    transform node.
+
+    Args:
+        node (guerilla.Transform): Guerilla euler or baked transform node.
+        srt (iterable[float]): SX, SY, SZ, RX, RY, RZ, TX, TY, TZ values.
+        current (tuple[float], optional): Current values, only plugs which
+          value changes are set if provided.
+
+    Returns:
+        bool: True if a plug was set.
+    """
+    if current is None:
+        current = (None,) * len(SRT_PLUG_NAMES)
+
+    changed = False
+
+    for plug_name, value, current_value in zip(SRT_PLUG_NAMES, srt, current):
+
+        value = float(value)
+
+        if value != current_value:
+            getattr(node, plug_name).set(value)
+            changed = True
+
+    return changed
+
+
+def get_srt_many(eulers, array=False):
+    """Return scale, rotation and translation values of many euler
+    transforms.
+
+    Args:
+        eulers (iterable[TransformEuler]): Euler transforms.
+        array (bool, optional): Return a NumPy array instead of tuples.
+
+    Returns:
+        list[tuple[float]]|numpy.ndarray: SX, SY, SZ, RX, RY, RZ, TX, TY, TZ
+          values of each euler transform, or (N, 9) array of them.
+    """
+    srt = [_read_srt(euler.node) for euler in eulers]
+
+    if array:
+        import numpy
+        return numpy.array(srt, dtype=float).reshape(-1, 9)
+
+    return srt
+
+
+def set_srt_many(eulers, srt):
+    """Set scale, rotation and translation values of many euler transforms
+    in a single Guerilla modifier.
+
+    Only plugs which value changes are set.
+
+    Args:
+        eulers (iterable[TransformEuler]): Euler transforms.
+        srt (numpy.ndarray|list[iterable[float]]): (N, 9) array, or SX, SY,
+          SZ, RX, RY, RZ, TX, TY, TZ values of each euler transform.
+
+    Raises:
+        ValueError: If there isn't a value set per euler transform.
+    """
+    eulers = list(eulers)
+
+    # NumPy arrays are converted to Python floats at once.
+    srt = srt.tolist() if hasattr(srt, 'tolist') else list(srt)
+
+    if len(srt) != len(eulers):
+        raise ValueError("expected {} srt values, got {}"
+                         .format(len(eulers), len(srt)))
+
+    changed = []
+
+    with guerilla.Modifier():
+        for euler, values in zip(eulers, srt):
+            if _write_srt(euler.node, values, _read_srt(euler.node)):
+                changed.append(euler)
+
+    for euler in changed:
+        euler._changed()
+
 
 class TransformTarget(Transform):
     """class representing a Guerilla target transform node.
     """
+    __slots__ = ()
 
     @staticmethod
     def _default_name():
@@ -253,13 +771,22 @@ class TransformTarget(Transform):
         return 'TransformTarget'
 
     @classmethod
-    def create(cls, node, mod, name=None):
+    def create(cls, node, mod, name=None, top_plug=None, target=None,
+               target_matrix=None):
         """Create default target transform on given Guerilla `node`.
 
         Args:
             node (guerilla.SceneGraphNode): Parent scene graph node.
             mod (guerilla.Modifier):
             name (str, optional): Transform node name.
+            top_plug (guerilla.Plug, optional): Input plug of the top
+              transform node, found by walking the stack if not provided.
+            target (guerilla.Node, optional): Existing target node to
+              connect, so it's shared with other target transforms. A new
+              target node is created if not provided.
+            target_matrix (list[float], optional): 16 values of the created
+              target node matrix. Default to the top transform node matrix,
+              offset by one in Z.
 
         Returns:
             Transform: The created target transform object.
@@ -269,19 +796,26 @@ class TransformTarget(Transform):
 
         transform_node = mod.createnode(name, cls.guerilla_type_name(), node)
 
-        target_node = mod.createnode(transform_node.path.replace('|', ''),
-                                     'Target', guerilla.Document())
+        if top_plug is None:
+            top_plug = get_top_transform_plug(node)
+
+        if target is None:
+
+            target = mod.createnode(transform_node.path.replace('|', ''),
+                                    'Target', guerilla.Document())
 
-        top_plug = get_top_transform_plug(node)
+            if target_matrix is None:
+                # Offset target one in Z.
+                mtx = top_plug.parent.getmatrix()
+                transform = guerilla.transform(mtx.asarray())
+                transform.translate(guerilla.point3(0.0, 0.0, 1.0))
+            else:
+                transform = guerilla.transform(list(target_matrix))
 
-        # Offset target one in Z.
-        mtx = top_plug.parent.getmatrix()
-        transform = guerilla.transform(mtx.asarray())
-        transform.translate(guerilla.point3(0.0, 0.0, 1.0))
-        target_node.Transform.set(transform)
+            target.Transform.set(transform)
 
         mod.connect(transform_node.TargetWorldTransform,
-                    target_node._WorldTransform)
+                    target._WorldTransform)
 
         mod.connect(top_plug, transform_node.Out)
 
@@ -296,10 +830,24 @@ class TransformTarget(Transform):
         """
         return self.node.TargetWorldTransform.getinput().parent
 
+    def _get_params(self):
+        return {'target_matrix': list(self.target.getmatrix().asarray())}
+
+    def _set_params(self, params):
+        if 'target_matrix' in params:
+            self.target.Transform.set(
+                guerilla.transform(params['target_matrix']))
+
+    @classmethod
+    def _check_params(cls, params):
+        if 'target_matrix' in params:
+            _float_values(params['target_matrix'], 'target_matrix', 16)
+
 
 class TransformBaked(Transform):
     """class representing a Guerilla baked transform node.
     """
+    __slots__ = ()
 
     @staticmethod
     def _default_name():
@@ -313,10 +861,38 @@ class TransformBaked(Transform):
     def guerilla_type_name():
         return 'TransformBaked'
 
+    def set_samples(self, frames, samples):
+        """Set animation keys of scale, rotation and translation plugs.
+
+        Args:
+            frames (list[float]): Frame of each sample.
+            samples (list[tuple[float]]): SX, SY, SZ, RX, RY, RZ, TX, TY, TZ
+              values of each frame, rotations in degrees.
+        """
+        for plug_name, values in zip(SRT_PLUG_NAMES, zip(*samples)):
+
+            plug = getattr(self.node, plug_name)
+
+            for frame, value in zip(frames, values):
+                plug.setkey(frame, value)
+
+        self._changed()
+
+    def _get_params(self):
+        return _get_srt_params(self.node)
+
+    def _set_params(self, params):
+        _set_srt_params(self.node, params)
+
+    @classmethod
+    def _check_params(cls, params):
+        _check_srt_params(params)
+
 
 class TransformConstraint(Transform):
     """class representing a Guerilla constraint transform node.
     """
+    __slots__ = ()
 
     @staticmethod
     def _default_name():
@@ -334,6 +910,7 @@ class TransformConstraint(Transform):
         """Clear list of constraining objects (like 'Clear' button).
         """
         self.node.Objects.removealldependencies()
+        self._changed()
 
     def add(self, node):
         """Add given node as a constraint to transform (like 'Add' button).
@@ -341,7 +918,22 @@ class TransformConstraint(Transform):
         Args:
             node (guerilla.SceneGraphNode): Node to add as constraint.
         """
-        self.node.createplug("Weight{}".format(node.path.replace('|', '')),
+        self._add(node, node.path)
+        self._changed()
+
+    def _add(self, node, path):
+        """Add given node as a constraint to transform.
+
+        Args:
+            node (guerilla.SceneGraphNode): Node to add as constraint.
+            path (str): Path of the node.
+
+        Returns:
+            guerilla.Plug: Weight plug of the node.
+        """
+        name = _weight_plug_name(path)
+
+        self.node.createplug(name,
                              "ConstraintTransformWeightPlug",
                              guerilla.types('float', desc={'min': 0,
                                                            'max': 1}),
@@ -349,10 +941,172 @@ class TransformConstraint(Transform):
                              1)
         self.node.Objects.adddependency(node.Transform)
 
+        return getattr(self.node, name)
+
+    def add_many(self, nodes, weights=None):
+        """Add given nodes as constraints in a single Guerilla modifier.
+
+        Args:
+            nodes (list[guerilla.SceneGraphNode]): Nodes to add as
+              constraint.
+            weights (float|list[float], optional): Weight of every node, or
+              of each node. Nodes get the default weight (1) if not provided.
+        """
+        with guerilla.Modifier():
+            add_constraint_objects([(self, nodes, weights)])
+
+        self._changed()
+
+    def remove(self, node):
+        """Remove given node from constraints.
+
+        Args:
+            node (guerilla.SceneGraphNode): Constraining node to remove.
+        """
+        with guerilla.Modifier():
+            self._remove(node)
+
+        self._changed()
+
+    def _remove(self, node):
+        """Remove given node from constraints.
+
+        Args:
+            node (guerilla.SceneGraphNode): Constraining node to remove.
+        """
+        self.node.Objects.removedependency(node.Transform)
+        self.weight_plug(node).delete()
+
+    def set_weights(self, weights):
+        """Set weight of given constraining nodes in a single Guerilla
+        modifier.
+
+        Args:
+            weights (dict[guerilla.SceneGraphNode, float]|list[tuple]):
+              Constraining node to weight relation, or (node, weight) pairs.
+        """
+        items = weights.items() if hasattr(weights, 'items') else weights
+
+        with guerilla.Modifier():
+            for node, weight in items:
+                self.weight_plug(node).set(weight)
+
+        self._changed()
+
+    @property
+    def objects(self):
+        """Return constraining nodes (like 'Objects' list).
+
+        Returns:
+            list[guerilla.SceneGraphNode]:
+        """
+        return [plug.parent
+                for plug in self.node.Objects.getdependencies()]
+
+    @property
+    def weights(self):
+        """Return weight of each constraining node, in `objects` order.
+
+        Returns:
+            list[float]:
+        """
+        return [self.weight_plug(node).get() for node in self.objects]
+
+    def weight_plug(self, node):
+        """Return weight plug of given constraining node.
+
+        Args:
+            node (guerilla.SceneGraphNode): Constraining node.
+
+        Returns:
+            guerilla.Plug:
+        """
+        return getattr(self.node, _weight_plug_name(node.path))
+
+    def _get_params(self):
+        objects = self.objects
+
+        return {'objects': [node.path for node in objects],
+                'weights': [self.weight_plug(node).get()
+                            for node in objects]}
+
+    def _set_params(self, params):
+        # Replace current constraining nodes.
+        for node in self.objects:
+            self._remove(node)
+
+        if params.get('objects'):
+            add_constraint_objects([(self,
+                                     [guerilla.pynode(path)
+                                      for path in params['objects']],
+                                     params.get('weights'))])
+
+    @classmethod
+    def _check_params(cls, params):
+        """Check constraining nodes exist and weights are numbers.
+
+        Raises:
+            KeyError: If a constraining node doesn't exist.
+            ValueError: If weights are invalid.
+        """
+        objects = params.get('objects') or []
+
+        for path in objects:
+            guerilla.pynode(path)
+
+        weights = params.get('weights')
+
+        if weights is not None and not isinstance(weights, (int, float)):
+            _float_values(weights, 'weights', len(objects))
+
+
+def _weight_plug_name(path):
+    """Return constraint weight plug name of node with given path.
+
+    Args:
+        path (str): Constraining node path.
+
+    Returns:
+        str:
+    """
+    return "Weight{}".format(path.replace('|', ''))
+
+
+def add_constraint_objects(constraints):
+    """Add constraining nodes to many constraint transforms.
+
+    Path of each constraining node is read once, even if it constrains many
+    transforms. Must be called inside a Guerilla modifier.
+
+    Args:
+        constraints (iterable[tuple]): Constraint transform, constraining
+          nodes and their weights (see `TransformConstraint.add_many()`).
+    """
+    paths = {}
+
+    for constraint, nodes, weights in constraints:
+
+        if weights is None or isinstance(weights, (int, float)):
+            weights = [weights] * len(nodes)
+
+        for node, weight in zip(nodes, weights):
+
+            try:
+                path = paths[id(node)][1]
+            except KeyError:
+                path = node.path
+                paths[id(node)] = (node, path)  # Keep node id valid.
+
+            weight_plug = constraint._add(node, path)
+
+            if weight is not None:
+                weight_plug.set(weight)
+
 
 class TransformShake(Transform):
     """class representing a Guerilla constraint transform node.
     """
+    __slots__ = ()
 
     @staticmethod
     def _default_name():
@@ -365,3 +1119,190 @@ class TransformShake(Transform):
     @staticmethod
     def guerilla_type_name():
         return 'TransformShake'
+
+    @property
+    def amplitude(self):
+        """Return shake amplitude.
+
+        Returns:
+            float:
+        """
+        return float(self.node.Amplitude.get())
+
+    @amplitude.setter
+    def amplitude(self, value):
+        self.set_params(amplitude=value)
+
+    @property
+    def frequency(self):
+        """Return shake frequency, in cycles per frame.
+
+        Returns:
+            float:
+        """
+        return float(self.node.Frequency.get())
+
+    @frequency.setter
+    def frequency(self, value):
+        self.set_params(frequency=value)
+
+    @property
+    def seed(self):
+        """Return shake random seed.
+
+        Returns:
+            int:
+        """
+        return int(self.node.Seed.get())
+
+    @seed.setter
+    def seed(self, value):
+        self.set_params(seed=value)
+
+    def set_params(self, amplitude=None, frequency=None, seed=None):
+        """Set shake parameters in a single Guerilla modifier.
+
+        Args:
+            amplitude (float, optional): Shake amplitude, unchanged if not
+              provided.
+            frequency (float, optional): Shake frequency, unchanged if not
+              provided.
+            seed (int, optional): Shake random seed, unchanged if not
+              provided.
+        """
+        set_shake_params([self], amplitude, frequency, seed)
+
+    def _get_params(self):
+        return {'amplitude': self.amplitude,
+                'frequency': self.frequency,
+                'seed': self.seed}
+
+    def _set_params(self, params):
+        _set_shake_plugs(self.node,
+                         params.get('amplitude'),
+                         params.get('frequency'),
+                         params.get('seed'))
+
+    @classmethod
+    def _check_params(cls, params):
+        for name in ('amplitude', 'frequency', 'seed'):
+            if params.get(name) is not None:
+                _float_values([params[name]], name, 1)
+
+
+def _set_shake_plugs(node, amplitude, frequency, seed):
+    """Set shake plugs of given Guerilla shake transform node.
+
+    Args:
+        node (guerilla.TransformShake): Guerilla shake transform node.
+        amplitude (float|None): Shake amplitude, unchanged if None.
+        frequency (float|None): Shake frequency, unchanged if None.
+        seed (int|None): Shake random seed, unchanged if None.
+    """
+    if amplitude is not None:
+        node.Amplitude.set(float(amplitude))
+
+    if frequency is not None:
+        node.Frequency.set(float(frequency))
+
+    if seed is not None:
+        node.Seed.set(int(seed))
+
+
+def _per_item(value, count, name):
+    """Return given value for each of `count` items.
+
+    Args:
+        value (object|list|None): Value of every item, or of each one.
+        count (int): Item count.
+        name (str): Parameter name, for error message.
+
+    Returns:
+        list:
+
+    Raises:
+        ValueError: If there isn't one value per item.
+    """
+    if value is None or not hasattr(value, '__len__'):
+        return [value] * count
+
+    if len(value) != count:
+        raise ValueError("expected {} {} values, got {}"
+                         .format(count, name, len(value)))
+
+    return list(value)
+
+
+def set_shake_params(shakes, amplitude=None, frequency=None, seed=None):
+    """Set parameters of many shake transforms in a single Guerilla modifier.
+
+    Args:
+        shakes (list[TransformShake]): Shake transforms.
+        amplitude (float|list[float], optional): Amplitude of every shake
+          transform, or of each one. Unchanged if not provided.
+        frequency (float|list[float], optional): Frequency of every shake
+          transform, or of each one. Unchanged if not provided.
+        seed (int|list[int], optional): Random seed of every shake transform,
+          or of each one. Unchanged if not provided.
+
+    Raises:
+        ValueError: If a list doesn't have one value per shake transform.
+    """
+    shakes = list(shakes)
+
+    values = list(zip(_per_item(amplitude, len(shakes), 'amplitude'),
+                      _per_item(frequency, len(shakes), 'frequency'),
+                      _per_item(seed, len(shakes), 'seed')))
+
+    with guerilla.Modifier():
+        for shake, (shake_amplitude, shake_frequency, shake_seed) in zip(
+                shakes, values):
+            _set_shake_plugs(shake.node, shake_amplitude, shake_frequency,
+                             shake_seed)
+
+    for shake in shakes:
+        shake._changed()
+
+
+def preview_shakes(shakes, frames):
+    """Return offsets of many shake transforms over a frame range, using
+    NumPy.
+
+    Shake parameters are read once per transform, offsets of every frame are
+    computed at once (see `matrix.shake_offsets()`).
+
+    Args:
+        shakes (list[TransformShake]): Shake transforms.
+        frames (iterable[float]): Frames to evaluate.
+
+    Returns:
+        numpy.ndarray: (len(shakes), len(frames), 3) array of X, Y, Z
+          offsets.
+    """
+    from .matrix import shake_offsets
+
+    params = [(shake.amplitude, shake.frequency, shake.seed)
+              for shake in shakes]
+
+    amplitudes, frequencies, seeds = zip(*params) if params else ((), (), ())
+
+    return shake_offsets(amplitudes, frequencies, seeds, list(frames))
+
+
+class TransformUnknown(Transform):
+    """class representing a Guerilla transform node of an unregistered type.
+
+    Only used by transform stacks created with `strict=False`.
+    """
+    __slots__ = ()
+
+    @staticmethod
+    def type_name():
+        return 'unknown'
+
+    @classmethod
+    def create(cls, node, mod, name=None, top_plug=None):
+        raise TypeError("unknown transforms can't be created")
+
+    def _get_params(self):
+        return {'guerilla_type': guerilla.getclassname(self.node)}
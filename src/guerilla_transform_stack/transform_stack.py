@@ -3,30 +3,28 @@ from __future__ import (absolute_import,
                         print_function,
                         unicode_literals)
 
-import guerilla
+import contextlib
+import difflib
+import itertools
+import weakref
 
-from .transform import (TransformEuler,
+from .backend import guerilla
+from .tracking import mark_changed, stack_generation
+from .transform import (SRT_PLUG_NAMES,
+                        add_constraint_objects,
+                        decompose_matrix,
+                        get_srt_many,
+                        set_srt_many,
+                        get_top_transform_plug,
+                        iter_transforms,
+                        relink_transforms,
+                        Transform,
+                        TransformEuler,
                         TransformTarget,
                         TransformBaked,
                         TransformConstraint,
-                        TransformShake)
-
-
-def iter_transforms(node):
-
-    cur_plug = node.Transform
-
-    while True:
-
-        in_plug = cur_plug.getinput()
-
-        if in_plug:
-            node = in_plug.parent
-            yield node
-        else:
-            raise StopIteration
-
-        cur_plug = node.In
+                        TransformShake,
+                        TransformUnknown)
 
 
 # All transform classes.
@@ -45,6 +43,461 @@ guerilla_type_name_to_class = {cls.guerilla_type_name(): cls
                                for cls in all_cls}
 
 
+def register_transform_class(cls):
+    """Register a transform class, so transform stacks wrap Guerilla
+    transform nodes of its type with it.
+
+    Can be used as a class decorator. A class registered with the type name
+    or Guerilla type name of another one replaces it.
+
+    Args:
+        cls (type): `Transform` subclass implementing `type_name()`,
+          `guerilla_type_name()` and `_default_name()`.
+
+    Returns:
+        type: Given class.
+
+    Raises:
+        TypeError: If `cls` isn't a `Transform` subclass.
+    """
+    if not (isinstance(cls, type) and issubclass(cls, Transform)):
+        raise TypeError("transform class must be a Transform subclass")
+
+    type_name_to_class[cls.type_name()] = cls
+    guerilla_type_name_to_class[cls.guerilla_type_name()] = cls
+
+    return cls
+
+
+def get_transform_class(class_name, strict=True):
+    """Return transform class wrapping Guerilla transform nodes of given
+    type.
+
+    Args:
+        class_name (str): Guerilla type name ('TransformEuler', etc).
+        strict (bool, optional): Raise on unregistered types instead of
+          returning `TransformUnknown`.
+
+    Returns:
+        type:
+
+    Raises:
+        TypeError: If type isn't registered and `strict` is True.
+    """
+    try:
+        return guerilla_type_name_to_class[class_name]
+    except KeyError:
+        if strict:
+            raise TypeError("invalid Guerilla transform type '{}'"
+                            .format(class_name))
+        return TransformUnknown
+
+
+def _spec_to_classes(spec):
+    """Return transform classes and names from transform types and names.
+
+    Args:
+        spec (list[tuple[str, str]]): Transform type and name (or None) of
+          each transform.
+
+    Returns:
+        list[tuple[type, str]]:
+
+    Raises:
+        ValueError: If a transform type is invalid.
+    """
+    classes_names = []
+
+    for type_, name in spec:
+
+        try:
+            cls = type_name_to_class[type_]
+        except KeyError:
+            raise ValueError("invalid transform type argument")
+
+        classes_names.append((cls, name))
+
+    return classes_names
+
+
+def _create_transforms(node, mod, classes_names, top_plug):
+    """Create transforms on top of the stack of given `node`.
+
+    Each created transform is connected to the previous one, so the top of
+    the stack is never searched again.
+
+    Args:
+        node (guerilla.SceneGraphNode): Parent scene graph node.
+        mod (guerilla.Modifier):
+        classes_names (list[tuple[type, str]]): Transform class and name (or
+          None) of each transform to create, from bottom to top.
+        top_plug (guerilla.Plug): Input plug of the top transform node.
+
+    Returns:
+        list[Transform]: Created transforms.
+    """
+    transforms = []
+
+    for cls, name in classes_names:
+
+        transform = cls.create(node, mod, name, top_plug)
+
+        top_plug = transform.node.In
+
+        transforms.append(transform)
+
+    return transforms
+
+
+def _build_transforms(node, mod, descriptions, top_plug):
+    """Create transforms on top of the stack of given `node` from their
+    descriptions.
+
+    Args:
+        node (guerilla.SceneGraphNode): Parent scene graph node.
+        mod (guerilla.Modifier):
+        descriptions (list[dict]): Transform descriptions, as returned by
+          `Transform.to_dict()`, from bottom to top.
+        top_plug (guerilla.Plug): Input plug of the top transform node.
+
+    Returns:
+        list[Transform]: Created transforms.
+    """
+    classes_names = _spec_to_classes((data['type'], data.get('name'))
+                                     for data in descriptions)
+
+    transforms = _create_transforms(node, mod, classes_names, top_plug)
+
+    for transform, data in zip(transforms, descriptions):
+        transform._set_params(data)
+
+    return transforms
+
+
+def _transform_descriptions(data):
+    """Return transform descriptions from a transform stack, or its
+    description.
+
+    Args:
+        data (TransformStack|dict|list[dict]): Transform stack, its
+          description (see `TransformStack.to_dict()`), or its transform
+          descriptions.
+
+    Returns:
+        list[dict]: Transform descriptions, from bottom to top.
+    """
+    if isinstance(data, TransformStack):
+        data = data.to_dict()
+
+    if isinstance(data, dict):
+        data = data['transforms']
+
+    return list(data)
+
+
+def _params(description):
+    """Return type specific parameters of given transform description.
+
+    Args:
+        description (dict): Transform description, as returned by
+          `Transform.to_dict()`.
+
+    Returns:
+        dict:
+    """
+    return {key: value for key, value in description.items()
+            if key not in ('type', 'name')}
+
+
+def bulk_add(nodes, spec):
+    """Add the same Guerilla transform nodes to many nodes in a single
+    Guerilla modifier.
+
+    Args:
+        nodes (list[guerilla.SceneGraphNode]): Parent scene graph nodes.
+        spec (list[tuple[str, str]]): Transform type and name (or None) of
+          each transform to add, from bottom to top.
+
+    Returns:
+        list[list[Transform]]: Created transforms of each node.
+    """
+    classes_names = _spec_to_classes(spec)
+
+    with guerilla.Modifier() as mod:
+        transforms = [_create_transforms(node, mod, classes_names,
+                                         get_top_transform_plug(node))
+                      for node in nodes]
+
+    for node, node_transforms in zip(nodes, transforms):
+        mark_changed(node.path, [t.node.name for t in node_transforms])
+
+    return transforms
+
+
+def constrain_many(nodes, drivers, weights=None, name=None):
+    """Add a constraint transform on top of many nodes and wire their
+    constraining nodes in a single Guerilla modifier.
+
+    Args:
+        nodes (list[guerilla.SceneGraphNode]): Parent scene graph nodes.
+        drivers (list[list[guerilla.SceneGraphNode]]): Constraining nodes of
+          each node. Use `[drivers] * len(nodes)` to constrain every node to
+          the same drivers.
+        weights (list[float|list[float]], optional): Weights of each node
+          constraining nodes (see `TransformConstraint.add_many()`).
+        name (str, optional): Name of the created constraint transforms.
+
+    Returns:
+        list[TransformConstraint]: Created constraint transform of each node.
+    """
+    if weights is None:
+        weights = [None] * len(nodes)
+
+    with guerilla.Modifier() as mod:
+
+        constraints = [TransformConstraint.create(
+                           node, mod, name, get_top_transform_plug(node))
+                       for node in nodes]
+
+        add_constraint_objects(zip(constraints, drivers, weights))
+
+    for node, constraint in zip(nodes, constraints):
+        mark_changed(node.path, [constraint.node.name])
+
+    return constraints
+
+
+def add_targets(nodes, offsets=(0.0, 0.0, 1.0), name=None, target=None):
+    """Add a target transform on top of many nodes in a single Guerilla
+    modifier.
+
+    Created target nodes matrices are the top transform node matrices,
+    translated by `offsets` in their own space, and are computed at once
+    using NumPy.
+
+    Args:
+        nodes (list[guerilla.SceneGraphNode]): Parent scene graph nodes.
+        offsets (list[float]|list[list[float]], optional): X, Y, Z offset of
+          every target node, or of each one.
+        name (str, optional): Name of the created target transforms.
+        target (guerilla.Node, optional): Existing target node shared by
+          every created target transform. No target node is created, nor
+          matrix computed, if provided.
+
+    Returns:
+        list[TransformTarget]: Created target transform of each node.
+    """
+    top_plugs = [get_top_transform_plug(node) for node in nodes]
+
+    if target is None:
+
+        from .matrix import translate
+
+        matrices = translate([plug.parent.getmatrix().asarray()
+                              for plug in top_plugs], offsets)
+
+        matrices = matrices.reshape(-1, 16).tolist()
+    else:
+        matrices = [None] * len(nodes)
+
+    with guerilla.Modifier() as mod:
+
+        targets = [TransformTarget.create(node, mod, name, top_plug, target,
+                                          mtx)
+                   for node, top_plug, mtx in zip(nodes, top_plugs,
+                                                  matrices)]
+
+    for node, t in zip(nodes, targets):
+        mark_changed(node.path, [t.node.name])
+
+    return targets
+
+
+def _stack_matrices(nodes, stacks_nodes):
+    """Return resulting matrix of transform stacks of given nodes.
+
+    Args:
+        nodes (list[guerilla.SceneGraphNode]): Parent scene graph nodes.
+        stacks_nodes (list[list[guerilla.Transform]]): Guerilla transform
+          nodes of each parent node, from bottom to top.
+
+    Returns:
+        numpy.ndarray: (len(nodes), 4, 4) array of matrices. Empty stacks
+          give the matrix of the node itself.
+    """
+    import numpy
+
+    from .matrix import local_matrices, reduce_stacks
+
+    matrices = reduce_stacks(
+        local_matrices(itertools.chain.from_iterable(stacks_nodes)),
+        [len(transform_nodes) for transform_nodes in stacks_nodes])
+
+    for i, (node, transform_nodes) in enumerate(zip(nodes, stacks_nodes)):
+        if not transform_nodes:
+            matrices[i] = numpy.reshape(node.getmatrix().asarray(), (4, 4))
+
+    return matrices
+
+
+def evaluate_many(stacks, world=False):
+    """Return resulting matrix of each given transform stack.
+
+    Matrices of every stack are computed at once using NumPy. See
+    `TransformStack.evaluate()`.
+
+    Args:
+        stacks (list[TransformStack]): Transform stacks to evaluate.
+        world (bool, optional): Multiply each matrix by the ones of the node
+          parents, evaluated the same way, to get world matrices. Parents
+          shared by many nodes are evaluated once.
+
+    Returns:
+        numpy.ndarray: (len(stacks), 4, 4) array of matrices. Empty stacks
+          give the matrix of the node itself.
+    """
+    from .matrix import reduce_stacks
+
+    if not world:
+        return _stack_matrices([ts.node for ts in stacks],
+                               [list(ts._nodes()) for ts in stacks])
+
+    # Every evaluated node, and its position in `nodes`.
+    nodes = []
+    stacks_nodes = []
+    positions = {}
+
+    chains = []
+
+    for ts in stacks:
+
+        chain = []
+
+        node = ts.node
+
+        while isinstance(node, guerilla.SceneGraphNode):
+
+            if node not in positions:
+                positions[node] = len(nodes)
+                nodes.append(node)
+                stacks_nodes.append(list(ts._nodes() if node is ts.node
+                                         else iter_transforms(node)))
+
+            chain.append(positions[node])
+
+            node = node.parent
+
+        chains.append(chain)
+
+    matrices = _stack_matrices(nodes, stacks_nodes)
+
+    # Node matrix first, root last.
+    return reduce_stacks(matrices[list(itertools.chain.from_iterable(chains))],
+                         [len(chain) for chain in chains])
+
+
+def _is_connected(plug):
+    """Return whether given plug is driven by, or drives, another plug.
+
+    Args:
+        plug (guerilla.Plug):
+
+    Returns:
+        bool:
+    """
+    return plug.getinput() is not None or bool(plug.getoutputs())
+
+
+def _iter_frames(frames):
+    """Set document frame to each given frame, restoring it at the end.
+
+    Args:
+        frames (iterable[float]): Frames to set.
+
+    Yields:
+        float: Current frame.
+    """
+    doc = guerilla.Document()
+
+    cur_frame = doc.getframe()
+
+    try:
+        for frame in frames:
+            doc.setframe(frame)
+            yield frame
+    finally:
+        doc.setframe(cur_frame)
+
+
+def _sample_matrices(nodes, frames):
+    """Return scale, rotation and translation values of given nodes matrix at
+    given frames.
+
+    Document frame is changed once per frame for every node, then restored.
+
+    Args:
+        nodes (list[guerilla.SceneGraphNode]): Scene graph nodes to sample.
+        frames (list[float]): Frames to sample.
+
+    Returns:
+        list[list[tuple[float]]]: SX, SY, SZ, RX, RY, RZ, TX, TY, TZ values
+          (rotations in degrees) of each frame, for each node.
+    """
+    samples = [[] for _ in nodes]
+
+    for _ in _iter_frames(frames):
+        for node, node_samples in zip(nodes, samples):
+            node_samples.append(decompose_matrix(node.getmatrix()))
+
+    return samples
+
+
+def bake_many(stacks, frames, name=None):
+    """Replace transforms of each given transform stack by a single baked
+    transform.
+
+    Every node matrix is sampled over `frames` first, then transforms are
+    deleted, and baked transforms are created and keyed in a single Guerilla
+    modifier. Baked transform holds the whole node matrix, so sampled
+    transforms can't be kept without applying their motion twice.
+
+    Args:
+        stacks (list[TransformStack]): Transform stacks to bake.
+        frames (iterable[float]): Frames to sample.
+        name (str, optional): Baked transform node name.
+
+    Returns:
+        list[TransformBaked]: Created baked transforms.
+    """
+    frames = list(frames)
+
+    samples = _sample_matrices([ts.node for ts in stacks], frames)
+
+    bakeds = []
+
+    with guerilla.Modifier() as mod:
+
+        for ts, node_samples in zip(stacks, samples):
+
+            deleted_nodes = list(ts._nodes())
+
+            for transform_node in deleted_nodes:
+                transform_node.delete()
+
+            baked = TransformBaked.create(ts.node, mod, name,
+                                          ts.node.Transform)
+            baked.set_samples(frames, node_samples)
+
+            ts._changed(deleted_nodes=deleted_nodes)
+
+            ts.invalidate()
+            ts._register(baked)
+
+            bakeds.append(baked)
+
+    return bakeds
+
+
 class TransformStack(object):
     """Main class representing the transform stack of a Guerilla node.
 
@@ -57,44 +510,101 @@ class TransformStack(object):
     Node
 
     Iterator go from Euler1 to Euler4.
+
+    When created with `cached=True`, the transform stack keep an ordered
+    snapshot of its Guerilla transform nodes so length, iteration and access
+    don't walk the plug chain again. The snapshot is invalidated by
+    modifications done through the transform stack and its transforms
+    (`add()`, `delete()`, `move_*()`). Modifications done outside of them
+    require an explicit call to `refresh()`.
+
+    Transform nodes are wrapped by the class registered for their Guerilla
+    type (see `register_transform_class()`). When created with
+    `strict=False`, transform nodes of unregistered types are wrapped by
+    `TransformUnknown` instead of raising `TypeError`.
     """
 
-    def __init__(self, node):
+    def __init__(self, node, cached=False, strict=True):
         """
 
         Args:
             node (guerilla.SceneGraphNode): Parent scene graph node.
+            cached (bool, optional): Keep a snapshot of the transform nodes
+              instead of walking the plug chain on each access.
+            strict (bool, optional): Raise on transform nodes of unregistered
+              types instead of wrapping them by `TransformUnknown`.
         """
         self.node = node
+        self.cached = cached
+        self.strict = strict
+        self._snapshot = None
+        self._index = None
+        self._wrappers = self._new_wrappers()
+        self._classes = {}
+        self._path = None
 
     def __repr__(self):
         return "{}('{}')".format(self.__class__.__name__, self.node.path)
 
     def __getitem__(self, item):
-        try:
-            return next((t for t in self
-                         if t.node.name == item))
-        except StopIteration:
+        """Return transform from its name, its position or a slice of
+        positions.
+
+        Args:
+            item (str|int|slice): Transform node name, or position from the
+              bottom of the stack.
+
+        Returns:
+            Transform|list[Transform]:
+
+        Raises:
+            KeyError: If there is no transform with given name.
+            IndexError: If position is out of range.
+        """
+        if isinstance(item, slice):
+            return [self._node_to_transform(n)
+                    for n in list(self._nodes())[item]]
+
+        if isinstance(item, int):
+            return self._node_to_transform(self._node_at(item))
+
+        node = self._node_from_name(item)
+
+        if node is None:
             raise KeyError("no Guerilla transform node with given name")
 
+        return self._node_to_transform(node)
+
+    def __contains__(self, item):
+        """Return if transform stack contains given transform or transform
+        name.
+
+        Args:
+            item (str|Transform): Transform node name or transform object.
+
+        Returns:
+            bool:
+        """
+        if isinstance(item, Transform):
+            node = self._node_from_name(item.node.name)
+            return node is not None and node.path == item.node.path
+
+        return self._node_from_name(item) is not None
+
     def __iter__(self):
         """Iterate over transforms in a bottom to top order.
 
         Yields:
             Transform:
         """
-        in_plug = self.node.Transform.getinput()
-
-        while in_plug:
-
-            cur_node = in_plug.parent
-
+        for cur_node in self._nodes():
             yield self._node_to_transform(cur_node)
 
-            in_plug = cur_node.In.getinput()
-
     def __len__(self):
 
+        if self.cached:
+            return len(self._nodes())
+
         i = 0
 
         in_plug = self.node.Transform.getinput()
@@ -107,23 +617,268 @@ class TransformStack(object):
 
         return i
 
-    @staticmethod
-    def __node_to_class(node):
+    def _nodes(self):
+        """Return Guerilla transform nodes in a bottom to top order.
+
+        Returns:
+            list[guerilla.Transform]|generator: Snapshot of transform nodes
+              if transform stack is cached, a generator walking the plug
+              chain otherwise.
+        """
+        if not self.cached:
+            return iter_transforms(self.node)
+
+        if self._snapshot is None:
+            self._snapshot = list(iter_transforms(self.node))
+
+        return self._snapshot
+
+    def _name_index(self):
+        """Return name to position index of cached transform nodes.
+
+        Returns:
+            dict[str, int]:
+        """
+        if self._index is None:
+            self._index = {n.name: i for i, n in enumerate(self._nodes())}
+
+        return self._index
+
+    def _node_from_name(self, name):
+        """Return Guerilla transform node with given name.
+
+        Args:
+            name (str): Transform node name.
+
+        Returns:
+            guerilla.Transform|None: None if there is no transform node
+              with given name.
+        """
+        if self.cached:
+            try:
+                return self._nodes()[self._name_index()[name]]
+            except KeyError:
+                return None
+
+        return next((n for n in self._nodes() if n.name == name), None)
+
+    def _node_at(self, i):
+        """Return Guerilla transform node at given position.
+
+        Args:
+            i (int): Position from the bottom of the stack, negative values
+              count from the top.
+
+        Returns:
+            guerilla.Transform:
+
+        Raises:
+            IndexError: If position is out of range.
+        """
+        if i >= 0 and not self.cached:
+            try:
+                return next(itertools.islice(self._nodes(), i, None))
+            except StopIteration:
+                raise IndexError("transform stack index out of range")
+
+        nodes = self._nodes() if self.cached else list(self._nodes())
+
+        try:
+            return nodes[i]
+        except IndexError:
+            raise IndexError("transform stack index out of range")
+
+    def _top_plug(self):
+        """Return input plug of the top transform node.
+
+        Returns:
+            guerilla.Plug: Input plug of the top transform node, or transform
+              plug of the parent node if transform stack is empty.
+        """
+        if not self.cached:
+            return get_top_transform_plug(self.node)
+
+        nodes = self._nodes()
+
+        return nodes[-1].In if nodes else self.node.Transform
+
+    def get(self, name, default=None):
+        """Return transform with given name, or `default` if there is none.
+
+        Args:
+            name (str): Transform node name.
+            default (object, optional): Value returned if there is no
+              transform with given name.
+
+        Returns:
+            Transform|object:
+        """
+        node = self._node_from_name(name)
+
+        if node is None:
+            return default
+
+        return self._node_to_transform(node)
+
+    def _node_path(self):
+        """Return path of the parent scene graph node, read once to track
+        changes.
+
+        Returns:
+            str:
+        """
+        if self._path is None:
+            self._path = self.node.path
+
+        return self._path
+
+    def _changed(self, transform_nodes=(), deleted_nodes=()):
+        """Record a change of the transform stack.
+
+        Args:
+            transform_nodes (iterable[guerilla.Transform], optional): Changed
+              transform nodes.
+            deleted_nodes (iterable[guerilla.Transform], optional): Deleted
+              transform nodes.
+        """
+        mark_changed(self._node_path(),
+                     [n.name for n in transform_nodes],
+                     [n.name for n in deleted_nodes])
+
+    @property
+    def generation(self):
+        """Return generation of the last change of the transform stack done
+        through the package.
+
+        Returns:
+            int: 0 if the transform stack never changed.
+        """
+        return stack_generation(self._node_path())
+
+    def refresh(self):
+        """Rebuild transform nodes snapshot from Guerilla plug chain.
+
+        Must be called when the transform stack is modified outside of this
+        object (directly using Guerilla API).
+        """
+        self.invalidate()
+
+        if self.cached:
+            self._nodes()
+
+    def _reordered(self, nodes):
+        """Update transform nodes snapshot after a reordering.
+
+        Args:
+            nodes (list[guerilla.Transform]): Transform nodes in their new
+              order, from bottom to top.
+        """
+        if self.cached:
+            self._snapshot = list(nodes)
+            self._index = None
+
+    def reorder(self, new_order):
+        """Reorder every transform of the stack in a single modifier.
+
+        Only connections which change are rewired.
+
+        Args:
+            new_order (list[str|Transform]): Every transform of the stack, or
+              transform names, from bottom to top.
+
+        Raises:
+            ValueError: If `new_order` doesn't contain every transform of the
+              stack exactly once.
+        """
+        names = [t.node.name if isinstance(t, Transform) else t
+                 for t in new_order]
+
+        nodes = list(self._nodes())
+
+        name_to_node = {n.name: n for n in nodes}
+
+        if len(names) != len(nodes) or set(names) != set(name_to_node):
+            raise ValueError("new order must contain every transform of the "
+                             "stack exactly once")
+
+        new_nodes = [name_to_node[name] for name in names]
+
+        with guerilla.Modifier() as mod:
+            relink_transforms(self.node, mod, nodes, new_nodes)
+
+        self._changed()
+        self._reordered(new_nodes)
+
+    def invalidate(self):
+        """Mark transform nodes snapshot as outdated.
+
+        Snapshot will be rebuilt on next access.
+        """
+        self._snapshot = None
+        self._index = None
+        self._wrappers = self._new_wrappers()
+        self._classes = {}
+
+    def _new_wrappers(self):
+        """Return an empty flyweight cache of transform objects.
+
+        Cached transform stacks keep a transform object per snapshot node.
+        Others only reuse transform objects still referenced elsewhere, so
+        the cache doesn't grow with iterations.
+
+        Returns:
+            dict[int, Transform]: Guerilla transform node id to transform
+              object relation.
+        """
+        if self.cached:
+            return {}
+
+        return weakref.WeakValueDictionary()
+
+    def _register(self, transform):
+        """Attach transform object to the transform stack.
+
+        Args:
+            transform (Transform): Transform object of a node of the stack.
+        """
+        transform._stack = self
+        self._wrappers[id(transform.node)] = transform
+
+        if self.cached:
+            self._classes[id(transform.node)] = (transform.node,
+                                                 type(transform))
+
+    def __node_to_class(self, node):
         """Return transform class from Guerilla transform node.
 
+        Cached transform stacks only read Guerilla type of each snapshot
+        transform node once.
+
         Args:
             node (guerilla.Transform): Guerilla transform node.
 
         Returns:
             type: Transform class to instantiate transform object.
+
+        Raises:
+            TypeError: If transform node type isn't registered and transform
+              stack is strict.
         """
-        class_name = guerilla.getclassname(node)
+        if self.cached:
 
-        try:
-            return guerilla_type_name_to_class[class_name]
-        except KeyError:
-            raise TypeError("invalid Guerilla transform type '{}'"
-                            .format(class_name))
+            cached_node, cls = self._classes.get(id(node), (None, None))
+
+            # Cache entry holds its node, so a node id can't be reused while
+            # it's in the cache.
+            if cached_node is node:
+                return cls
+
+        cls = get_transform_class(guerilla.getclassname(node), self.strict)
+
+        if self.cached:
+            self._classes[id(node)] = (node, cls)
+
+        return cls
 
     def _node_to_transform(self, node):
         """Return transform object from Guerilla transform node.
@@ -132,9 +887,18 @@ class TransformStack(object):
             node (guerilla.Transform): Guerilla transform node.
 
         Returns:
-            Transform: Transform object.
+            Transform: Transform object, the same for a given node object as
+              long as it's cached.
         """
-        return self.__node_to_class(node)(node)
+        transform = self._wrappers.get(id(node))
+
+        # Transform object holds its node, so a node id can't be reused while
+        # its transform object is in the cache.
+        if transform is None or transform.node is not node:
+            transform = self.__node_to_class(node)(node, self)
+            self._wrappers[id(node)] = transform
+
+        return transform
 
     def add(self, type_, name=None):
         """Add Guerilla transform node with given `type_`.
@@ -147,13 +911,535 @@ class TransformStack(object):
         Returns:
             Transform:
         """
-        try:
-            cls = type_name_to_class[type_]
-        except KeyError:
-            raise ValueError("invalid transform type argument")
+        return self.add_many([(type_, name)])[0]
+
+    def add_many(self, spec):
+        """Add Guerilla transform nodes in a single Guerilla modifier.
+
+        Transforms are added from bottom to top, in given order.
+
+        Args:
+            spec (list[tuple[str, str]]): Transform type and name (or None)
+              of each transform to add.
+
+        Returns:
+            list[Transform]: Created transforms.
+        """
+        classes_names = _spec_to_classes(spec)
 
         with guerilla.Modifier() as mod:
-            return cls.create(self.node, mod, name)
+            transforms = _create_transforms(self.node, mod, classes_names,
+                                            self._top_plug())
+
+        self._changed([t.node for t in transforms])
+
+        for transform in transforms:
+
+            self._register(transform)
+
+            if self.cached:
+                if self._index is not None:
+                    self._index[transform.node.name] = len(self._snapshot)
+                self._snapshot.append(transform.node)
+
+        return transforms
+
+    def to_dict(self):
+        """Return serializable description of the transform stack.
+
+        Returns:
+            dict: Parent node path and transform descriptions, from bottom to
+              top.
+        """
+        return {'node': self.node.path,
+                'transforms': [t.to_dict() for t in self]}
+
+    @classmethod
+    def from_dict(cls, data, node=None, cached=False):
+        """Create transforms described in `data` in a single Guerilla
+        modifier.
+
+        Transforms are added on top of existing ones.
+
+        Args:
+            data (dict): Transform stack description, as returned by
+              `to_dict()`.
+            node (guerilla.SceneGraphNode, optional): Parent scene graph
+              node, found from description node path if not provided.
+            cached (bool, optional): See `TransformStack`.
+
+        Returns:
+            TransformStack:
+        """
+        if node is None:
+            node = guerilla.pynode(data['node'])
+
+        ts = cls(node, cached)
+
+        with guerilla.Modifier() as mod:
+            transforms = _build_transforms(node, mod, data['transforms'],
+                                           ts._top_plug())
+
+        ts._changed([t.node for t in transforms])
+        ts.invalidate()
+
+        return ts
+
+    @contextlib.contextmanager
+    def edit(self):
+        """Edit the transform stack in a transaction committed in a single
+        Guerilla modifier when the block exits.
+
+        Nothing is applied if the block raises.
+
+            >>> with ts.edit() as tx:
+            ...     tx.delete('Euler')
+            ...     tx.move_top(tx.add('shake'))
+
+        Yields:
+            StackTransaction: Transaction queueing modifications.
+        """
+        from .transaction import StackTransaction
+
+        transaction = StackTransaction(self)
+
+        yield transaction
+
+        transaction.commit()
+
+    def diff(self, other, replace=()):
+        """Return operations turning the transform stack into another one.
+
+        Transforms are matched by type and name, using a sequence matching
+        algorithm, so the patch is minimal. A transform existing on both
+        sides but out of the matching sequence is moved instead of being
+        deleted and created again.
+
+        Patch operations are (in order of application):
+
+        - `{'op': 'delete', 'name': name}`
+        - `{'op': 'insert', 'index': i, 'transform': description}`
+        - `{'op': 'move', 'name': name, 'index': i}`
+        - `{'op': 'set', 'name': name, 'params': params}`
+
+        Where `index` is the final position of the transform from the bottom
+        of the stack.
+
+        Args:
+            other (TransformStack|dict|list[dict]): Transform stack, its
+              description (see `to_dict()`), or its transform descriptions.
+            replace (iterable[str], optional): Names of transforms never
+              matched, so they are deleted and created again if `other` has
+              a transform with the same type and name.
+
+        Returns:
+            list[dict]: Patch operations, to give to `apply()`.
+        """
+        old = _transform_descriptions(self)
+        new = _transform_descriptions(other)
+
+        replace = set(replace)
+
+        # Replaced transforms get a key no new transform has.
+        old_keys = [(t['type'], t['name'], t['name'] in replace)
+                    for t in old]
+        new_keys = [(t['type'], t['name'], False) for t in new]
+
+        matcher = difflib.SequenceMatcher(None, old_keys, new_keys,
+                                          autojunk=False)
+
+        # Old and new position of each matched transform.
+        matched = []
+
+        removed = {}  # Key to old position.
+        added = {}  # Key to new position.
+
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+
+            if tag == 'equal':
+                matched.extend(zip(range(i1, i2), range(j1, j2)))
+                continue
+
+            for i in range(i1, i2):
+                removed[old_keys[i]] = i
+
+            for j in range(j1, j2):
+                added[new_keys[j]] = j
+
+        moved = set(removed) & set(added)
+
+        patch = []
+
+        for key, i in sorted(removed.items(), key=lambda item: item[1]):
+            if key not in moved:
+                patch.append({'op': 'delete', 'name': key[1]})
+
+        for key, j in sorted(added.items(), key=lambda item: item[1]):
+            if key not in moved:
+                patch.append({'op': 'insert', 'index': j,
+                              'transform': new[j]})
+
+        for key in sorted(moved, key=added.get):
+            patch.append({'op': 'move', 'name': key[1],
+                          'index': added[key]})
+            matched.append((removed[key], added[key]))
+
+        for i, j in sorted(matched, key=lambda item: item[1]):
+
+            params = _params(new[j])
+
+            if _params(old[i]) != params:
+                patch.append({'op': 'set', 'name': new_keys[j][1],
+                              'params': params})
+
+        return patch
+
+    def apply(self, patch):
+        """Apply operations returned by `diff()` in a single Guerilla
+        modifier.
+
+        Transforms not touched by the patch keep their Guerilla node and
+        their connections.
+
+        Args:
+            patch (list[dict]): Patch operations, as returned by `diff()`.
+
+        Returns:
+            list[Transform]: Inserted transforms.
+
+        Raises:
+            ValueError: If a patch operation is invalid for this transform
+              stack. Operations and parameters are checked before the
+              transform stack is modified.
+        """
+        if not patch:
+            return []
+
+        nodes = list(self._nodes())
+
+        name_to_node = {n.name: n for n in nodes}
+
+        ops = {'delete': [], 'insert': [], 'move': [], 'set': []}
+
+        for op in patch:
+            try:
+                ops[op['op']].append(op)
+            except KeyError:
+                raise ValueError("invalid patch operation '{}'"
+                                 .format(op['op']))
+
+        for op in ops['delete'] + ops['move'] + ops['set']:
+            if op['name'] not in name_to_node:
+                raise ValueError("no transform named '{}' in stack"
+                                 .format(op['name']))
+
+        deleted = {op['name'] for op in ops['delete']}
+
+        remaining = [n for n in nodes if n.name not in deleted]
+
+        # Final position of inserted and moved transform nodes, others keep
+        # their relative order.
+        new_nodes = [None] * (len(remaining) + len(ops['insert']))
+
+        moved = {op['name']: op['index'] for op in ops['move']}
+
+        indices = [op['index'] for op in ops['insert']] + list(moved.values())
+
+        if (len(set(indices)) != len(indices) or
+                not all(0 <= i < len(new_nodes) for i in indices)):
+            raise ValueError("invalid patch positions")
+
+        # Check parameters before deleting anything.
+        for (cls, _), op in zip(
+                _spec_to_classes((op['transform']['type'], None)
+                                 for op in ops['insert']),
+                ops['insert']):
+            cls._check_params(_params(op['transform']))
+
+        for op in ops['set']:
+            self.__node_to_class(
+                name_to_node[op['name']])._check_params(op['params'])
+
+        with guerilla.Modifier() as mod:
+
+            for name in deleted:
+                name_to_node[name].delete()
+
+            transforms = _build_transforms(
+                self.node, mod, [op['transform'] for op in ops['insert']],
+                remaining[-1].In if remaining else self.node.Transform)
+
+            for op, transform in zip(ops['insert'], transforms):
+                new_nodes[op['index']] = transform.node
+
+            for name, index in moved.items():
+                new_nodes[index] = name_to_node[name]
+
+            untouched = iter([n for n in remaining if n.name not in moved])
+
+            new_nodes = [node if node is not None else next(untouched)
+                         for node in new_nodes]
+
+            relink_transforms(self.node, mod,
+                              remaining + [t.node for t in transforms],
+                              new_nodes)
+
+            for op in ops['set']:
+                self._node_to_transform(
+                    name_to_node[op['name']])._set_params(op['params'])
+
+        self._changed([t.node for t in transforms] +
+                      [name_to_node[op['name']]
+                       for op in ops['move'] + ops['set']],
+                      [name_to_node[name] for name in deleted])
+        self._reordered(new_nodes)
+
+        for transform in transforms:
+            self._register(transform)
+
+        return transforms
+
+    def _eulers(self):
+        """Return euler transforms of the stack.
+
+        Returns:
+            list[TransformEuler]: Euler transforms, from bottom to top.
+        """
+        return [t for t in self if isinstance(t, TransformEuler)]
+
+    def get_srt(self, array=False):
+        """Return scale, rotation and translation values of every euler
+        transform of the stack (see `transform.get_srt_many()`).
+
+        Args:
+            array (bool, optional): Return a NumPy array instead of tuples.
+
+        Returns:
+            list[tuple[float]]|numpy.ndarray: Values of each euler transform,
+              from bottom to top.
+        """
+        return get_srt_many(self._eulers(), array)
+
+    def set_srt(self, srt):
+        """Set scale, rotation and translation values of every euler
+        transform of the stack in a single Guerilla modifier (see
+        `transform.set_srt_many()`).
+
+        Args:
+            srt (numpy.ndarray|list[iterable[float]]): Values of each euler
+              transform, from bottom to top.
+
+        Raises:
+            ValueError: If there isn't a value set per euler transform.
+        """
+        set_srt_many(self._eulers(), srt)
+
+    def evaluate(self, accumulate=False, world=False):
+        """Return matrices of transforms, from bottom to top, using NumPy.
+
+        Euler and baked transforms are evaluated from their SRT plugs. Other
+        transform types give identity matrices.
+
+        Args:
+            accumulate (bool, optional): Return the product of each transform
+              matrix with the ones below it instead of local matrices. Last
+              matrix is then the matrix of the whole stack.
+            world (bool, optional): Multiply matrices by the world matrix of
+              the node parent (see `evaluate_many()`). With `accumulate`,
+              last matrix is then the world matrix of the node.
+
+        Returns:
+            numpy.ndarray: (N, 4, 4) array of matrices.
+        """
+        import numpy
+
+        from .matrix import local_matrices, accumulate as accumulate_
+
+        matrices = local_matrices(self._nodes())
+
+        if accumulate:
+            matrices = accumulate_(matrices)
+
+        parent = self.node.parent
+
+        if world and isinstance(parent, guerilla.SceneGraphNode):
+            matrices = numpy.matmul(
+                matrices, evaluate_many([TransformStack(parent)],
+                                        world=True)[0])
+
+        return matrices
+
+    def bake(self, frames, name=None):
+        """Replace transforms of the stack by a single baked transform.
+
+        Node matrix is sampled over `frames`, then transforms are deleted,
+        and baked transform is created and keyed in a single Guerilla
+        modifier. See `bake_many()` to bake many transform stacks at once.
+
+        Args:
+            frames (iterable[float]): Frames to sample.
+            name (str, optional): Baked transform node name.
+
+        Returns:
+            TransformBaked: Created baked transform.
+        """
+        return bake_many([self], frames, name)[0]
+
+    def _flatten_runs(self, keep):
+        """Return runs of contiguous euler and baked transform nodes.
+
+        Transform nodes which SRT plugs are connected break runs too, as
+        their connections would be lost.
+
+        Args:
+            keep (set[str]): Transform node names breaking runs.
+
+        Returns:
+            list[tuple[int, list[guerilla.Transform]]]: Position of the
+              bottom transform node of each run, and transform nodes of the
+              run, from bottom to top. Only runs of two or more transform
+              nodes are returned.
+        """
+        runs = []
+
+        run = []
+
+        for i, node in enumerate(itertools.chain(self._nodes(), [None])):
+
+            if (node is not None and
+                    node.name not in keep and
+                    guerilla.getclassname(node) in (
+                        TransformEuler.guerilla_type_name(),
+                        TransformBaked.guerilla_type_name()) and
+                    not any(_is_connected(getattr(node, plug_name))
+                            for plug_name in SRT_PLUG_NAMES)):
+                run.append(node)
+                continue
+
+            if len(run) > 1:
+                runs.append((i - len(run), run))
+
+            run = []
+
+        return runs
+
+    def flatten(self, keep=(), frames=None):
+        """Replace runs of contiguous euler and baked transforms by a single
+        transform.
+
+        Static runs are replaced by an euler transform with the same
+        resulting matrix. Animated runs are replaced by a baked transform
+        sampled over `frames`, and are left untouched if `frames` is not
+        provided. Runs which resulting matrix has shear, at any sampled
+        frame, can't be held by a single transform and are left untouched
+        too. Target, constraint and shake transforms, and transforms which
+        SRT plugs are connected, are never flattened. Replacing transform
+        takes the name of the bottom transform of its run.
+
+        Args:
+            keep (iterable[str|Transform]): Transforms, or transform names,
+              to leave untouched.
+            frames (iterable[float], optional): Frames to sample animated runs
+              on.
+
+        Returns:
+            list[Transform]: Created transforms.
+        """
+        from .matrix import (decompose,
+                             local_matrices,
+                             reduce_stacks,
+                             round_trips)
+
+        keep = {t.node.name if isinstance(t, Transform) else t for t in keep}
+
+        nodes = list(self._nodes())
+
+        static_runs = []
+        animated_runs = []
+
+        for i, run in self._flatten_runs(keep):
+
+            if any(getattr(n, plug_name).isanimated()
+                   for n in run
+                   for plug_name in SRT_PLUG_NAMES):
+                if frames is not None:
+                    animated_runs.append((i, run))
+            else:
+                static_runs.append((i, run))
+
+        def runs_srt(runs):
+            """Return SRT values of the resulting matrix of each run, and
+            whether they give this matrix back (they can't hold shear)."""
+            matrices = reduce_stacks(
+                local_matrices(
+                    itertools.chain.from_iterable(run for _, run in runs)),
+                [len(run) for _, run in runs])
+
+            srt = decompose(matrices)
+
+            return srt, round_trips(srt, matrices)
+
+        replacements = []
+
+        if static_runs:
+
+            srt, exact = runs_srt(static_runs)
+
+            for j, (i, run) in enumerate(static_runs):
+                if exact[j]:
+                    replacements.append((i, run, TransformEuler, srt[j]))
+
+        if animated_runs:
+
+            frames = list(frames)
+
+            samples = [runs_srt(animated_runs) for _ in _iter_frames(frames)]
+
+            for j, (i, run) in enumerate(animated_runs):
+                if all(exact[j] for _, exact in samples):
+                    replacements.append((i, run, TransformBaked,
+                                         [srt[j].tolist()
+                                          for srt, _ in samples]))
+
+        transforms = []
+
+        with guerilla.Modifier() as mod:
+
+            for i, run, cls, values in replacements:
+
+                name = run[0].name
+
+                below_plug = nodes[i - 1].In if i else self.node.Transform
+
+                above_node = (nodes[i + len(run)]
+                              if i + len(run) < len(nodes) else None)
+
+                for node in run:
+                    node.delete()
+
+                transform = cls.create(self.node, mod, name, below_plug)
+
+                if cls is TransformEuler:
+                    for plug_name, value in zip(SRT_PLUG_NAMES, values):
+                        getattr(transform.node, plug_name).set(float(value))
+                else:
+                    transform.set_samples(frames, values)
+
+                if above_node is not None:
+                    mod.connect(transform.node.In, above_node.Out)
+
+                transforms.append(transform)
+
+        if transforms:
+            self._changed([t.node for t in transforms],
+                          [node for _, run, _, _ in replacements
+                           for node in run])
+            self.invalidate()
+
+        for transform in transforms:
+            self._register(transform)
+
+        return transforms
 
     @property
     def top(self):
@@ -165,6 +1451,15 @@ class TransformStack(object):
         Raises:
             ValueError: If transform stack is empty.
         """
+        if self.cached:
+            nodes = self._nodes()
+
+            if not nodes:
+                raise ValueError("transform stack is empty for node '{}'"
+                                 .format(self.node.path))
+
+            return self._node_to_transform(nodes[-1])
+
         transform_node = self.node.gettransform()
 
         if transform_node.path == self.node.path:
@@ -183,6 +1478,15 @@ class TransformStack(object):
         Raises:
             ValueError: If transform stack is empty.
         """
+        if self.cached:
+            nodes = self._nodes()
+
+            if not nodes:
+                raise ValueError("transform stack is empty for node '{}'"
+                                 .format(self.node.path))
+
+            return self._node_to_transform(nodes[0])
+
         cur_plug = self.node.Transform
 
         in_plug = cur_plug.getinput()
@@ -200,4 +1504,7 @@ class TransformStack(object):
         Returns:
             bool: True if transform stack is empty.
         """
+        if self.cached:
+            return not self._nodes()
+
         return self.node.gettransform().path == self.node.path